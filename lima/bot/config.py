@@ -27,6 +27,11 @@ API_TIMEOUT = int(os.getenv('API_TIMEOUT', '30'))  # Timeout em segundos
 # Pode ser definido diretamente ou obtido via autenticação
 API_ACCESS_TOKEN = os.getenv('BOT_API_ACCESS_TOKEN', '')
 
+# Arquivo que persiste os dados de usuário/chat entre reinícios. É de
+# um único processo: vários workers sobrescreveriam o arquivo uns dos
+# outros. Vazio mantém os dados apenas em memória.
+BOT_PERSISTENCE_FILE = os.getenv('BOT_PERSISTENCE_FILE', '')
+
 # Configurações de log
 LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
 
@@ -19,6 +19,7 @@ from .endereco import (
     formatar_endereco,
     formatar_endereco_detalhado,
     formatar_lista_resultados,
+    iterar_lista_resultados,
 )
 from .sugestao import formatar_sugestao
 
@@ -27,6 +28,7 @@ __all__ = [
     'formatar_endereco',
     'formatar_endereco_detalhado',
     'formatar_lista_resultados',
+    'iterar_lista_resultados',
     'formatar_sugestao',
     'formatar_anotacao',
     'filtrar_anotacoes_por_proprietario',
@@ -67,6 +67,18 @@ def filtrar_anotacoes_por_proprietario(
     return anotacoes_proprias, anotacoes_outras
 
 
+def _logar_ids_usuario(anotacoes: List[Dict[str, Any]]) -> None:
+    """Registra, em debug, o id_usuario de cada anotação e o seu tipo."""
+    for i, a in enumerate(anotacoes):
+        id_usuario_anotacao = a.get('id_usuario')
+        logging.debug(
+            'Anotação %s: id_usuario=%r (tipo: %s)',
+            i,
+            id_usuario_anotacao,
+            type(id_usuario_anotacao),
+        )
+
+
 def filtrar_anotacoes_por_privilegio(
     anotacoes: List[Dict[str, Any]],
     usuario_id: int,
@@ -77,28 +89,28 @@ def filtrar_anotacoes_por_privilegio(
     Retorna (anotacoes_proprias, anotacoes_outras).
     """
     # Log de entrada da função
-    logging.info(
-        f'[FILTRO_ANOTACOES] Iniciando filtro: usuario_id={usuario_id}, '
-        f'nivel_acesso={nivel_acesso}, total_anotacoes={len(anotacoes)}'
+    logging.debug(
+        '[FILTRO_ANOTACOES] Iniciando filtro: usuario_id=%s, '
+        'nivel_acesso=%s, total_anotacoes=%s',
+        usuario_id,
+        nivel_acesso,
+        len(anotacoes),
     )
 
     # Debug: Log dos tipos e valores para diagnóstico
-    logging.info(
-        f'Filtrando anotações: usuario_id={usuario_id} '
-        f'(tipo: {type(usuario_id)})'
+    logging.debug(
+        'Filtrando anotações: usuario_id=%r (tipo: %s)',
+        usuario_id,
+        type(usuario_id),
     )
-    for i, a in enumerate(anotacoes):
-        id_usuario_anotacao = a.get('id_usuario')
-        logging.info(
-            f'Anotação {i}: id_usuario={id_usuario_anotacao} '
-            f'(tipo: {type(id_usuario_anotacao)})'
-        )
+    if logging.getLogger().isEnabledFor(logging.DEBUG):
+        _logar_ids_usuario(anotacoes)
 
     # Converte usuario_id para int para garantir comparação correta
     try:
         usuario_id_int = int(usuario_id)
     except (ValueError, TypeError):
-        logging.error(f'Erro ao converter usuario_id para int: {usuario_id}')
+        logging.error('Erro ao converter usuario_id para int: %s', usuario_id)
         usuario_id_int = usuario_id
 
     # Agrupa anotações próprias usando comparação robusta de tipos
@@ -117,8 +129,9 @@ def filtrar_anotacoes_por_privilegio(
     # Verificação de privilégios: usuários básicos só veem suas próprias
     if nivel_acesso == 'basico':
         anotacoes_outras = []
-        logging.info(
-            f'Usuário básico {usuario_id}: exibindo apenas anotações próprias'
+        logging.debug(
+            'Usuário básico %s: exibindo apenas anotações próprias',
+            usuario_id,
         )
     else:
         # Usuários intermediários e superiores podem ver todas as anotações
@@ -133,13 +146,16 @@ def filtrar_anotacoes_por_privilegio(
                 # Se não conseguir converter, tenta comparação direta
                 if id_usuario_anotacao != usuario_id:
                     anotacoes_outras.append(a)
-        logging.info(
-            f'Usuário {nivel_acesso} {usuario_id}: exibindo todas as anotações'
+        logging.debug(
+            'Usuário %s %s: exibindo todas as anotações',
+            nivel_acesso,
+            usuario_id,
         )
 
-    logging.info(
-        f'[FILTRO_ANOTACOES] Resultado da filtragem: '
-        f'{len(anotacoes_proprias)} próprias, {len(anotacoes_outras)} outras'
+    logging.debug(
+        '[FILTRO_ANOTACOES] Resultado da filtragem: %s próprias, %s outras',
+        len(anotacoes_proprias),
+        len(anotacoes_outras),
     )
 
     return anotacoes_proprias, anotacoes_outras
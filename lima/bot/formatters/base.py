@@ -2,7 +2,12 @@
 Funcões básicas de formatação e escape para o bot Telegram.
 """
 
-import re
+# Caracteres que precisam ser escapados no MarkdownV2, já mapeados para a
+# forma com barra: str.translate faz a troca numa única passada
+_CARACTERES_MARKDOWN_V2 = r'_*[]()~`>#+-=|{}.!'
+_TABELA_MARKDOWN_V2 = str.maketrans({
+    caractere: f'\\{caractere}' for caractere in _CARACTERES_MARKDOWN_V2
+})
 
 
 def escape_markdown(text: str) -> str:
@@ -18,6 +23,4 @@ def escape_markdown(text: str) -> str:
     if not text:
         return ''
 
-    # Caracteres que precisam ser escapados no MarkdownV2
-    escape_chars = r'_*[]()~`>#+-=|{}.!'
-    return re.sub(f'([{re.escape(escape_chars)}])', r'\\\1', str(text))
+    return str(text).translate(_TABELA_MARKDOWN_V2)
@@ -2,7 +2,7 @@
 Formatadores para exibição de endereços no Telegram.
 """
 
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List
 
 from .base import escape_markdown
 
@@ -228,14 +228,21 @@ def formatar_endereco_detalhado(endereco: Dict[str, Any]) -> str:
     return '\n'.join(mensagem_partes)
 
 
-def formatar_lista_resultados(
+# Separador entre itens, já escapado para MarkdownV2
+_SEPARADOR_RESULTADOS = '\n\n\\-\\-\\-\\-\\-\\-\n\n'
+
+
+def iterar_lista_resultados(
     resultados: List[Dict[str, Any]],
     pagina_atual: int,  # 0-based internamente
     total_paginas: int,
     formatador,
-) -> str:
+) -> Iterator[str]:
     """
-    Formata uma lista de resultados com paginação.
+    Gera, em ordem, os trechos da lista de resultados com paginação.
+
+    Permite que quem monta a mensagem junte cabeçalho e lista num único
+    ''.join, sem concatenar strings intermediárias.
 
     Args:
         resultados: Lista de itens a formatar.
@@ -243,28 +250,49 @@ def formatar_lista_resultados(
         total_paginas: Total de páginas.
         formatador: Função que formata cada item individual.
 
-    Returns:
-        Texto formatado com a lista de resultados e informações de página
-        (se houver mais de uma página).
+    Yields:
+        Trechos do texto formatado (itens, separadores e rodapé).
     """
     if not resultados:
-        return 'Nenhum resultado encontrado\\.'
+        yield 'Nenhum resultado encontrado\\.'
+        return
 
-    partes_mensagem = [formatador(item) for item in resultados]
-    # Corrigido o escape do separador para MarkdownV2
-    mensagem_formatada = '\n\n\\-\\-\\-\\-\\-\\-\n\n'.join(partes_mensagem)
+    for indice, item in enumerate(resultados):
+        if indice:
+            yield _SEPARADOR_RESULTADOS
+        yield formatador(item)
 
     # Adiciona informações de página apenas se houver mais de uma página
     if total_paginas > 1:
-        # Ajusta para 1-based para exibição
-        pagina_a_exibir = pagina_atual + 1
-        # Garante que pagina_a_exibir não exceda total_paginas
-        pagina_a_exibir = min(pagina_a_exibir, total_paginas)
-
-        rodape_pagina = (
+        # Ajusta para 1-based para exibição, sem exceder total_paginas
+        pagina_a_exibir = min(pagina_atual + 1, total_paginas)
+        yield (
             f'\n\\-\\-\\-\\-\\-\\-\n'
             f'*Página {pagina_a_exibir} de {total_paginas}*'
         )
-        mensagem_formatada += rodape_pagina
 
-    return mensagem_formatada
+
+def formatar_lista_resultados(
+    resultados: List[Dict[str, Any]],
+    pagina_atual: int,  # 0-based internamente
+    total_paginas: int,
+    formatador,
+) -> str:
+    """
+    Formata uma lista de resultados com paginação.
+
+    Args:
+        resultados: Lista de itens a formatar.
+        pagina_atual: Número da página atual (0-based).
+        total_paginas: Total de páginas.
+        formatador: Função que formata cada item individual.
+
+    Returns:
+        Texto formatado com a lista de resultados e informações de página
+        (se houver mais de uma página).
+    """
+    return ''.join(
+        iterar_lista_resultados(
+            resultados, pagina_atual, total_paginas, formatador
+        )
+    )
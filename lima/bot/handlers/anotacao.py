@@ -936,7 +936,8 @@ async def listar_anotacoes_command(
                 )
             return
 
-        mensagem = '📝 *Suas Anotações*\\n\\n'
+        # Fragmentos acumulados numa lista e unidos uma única vez no fim
+        partes = ['📝 *Suas Anotações*\n\n']
 
         for anotacao_dict in anotacoes_dicts:
             try:
@@ -957,24 +958,19 @@ async def listar_anotacoes_command(
 
             if enderecos_anotacao:
                 endereco_formatado = formatar_endereco(enderecos_anotacao[0])
-                mensagem += f'📍 *Endereço*: {endereco_formatado}\\n'
-                mensagem += (
-                    f'📝 *Anotação*: {escape_markdown(anotacao_obj.texto)}\\n'
-                )
-                mensagem += '\\n'
+                partes.append(f'📍 *Endereço*: {endereco_formatado}\n')
             else:
                 id_endereco_str = str(anotacao_obj.id_endereco)
-                mensagem += (
+                partes.append(
                     f'⚠️ *Endereço ID {escape_markdown(id_endereco_str)} '
-                    f'não encontrado ou inacessível*\\n'
-                )
-                mensagem += (
-                    f'📝 *Anotação*: {escape_markdown(anotacao_obj.texto)}\\n'
+                    f'não encontrado ou inacessível*\n'
                 )
-                mensagem += '\\n'
+            partes.append(
+                f'📝 *Anotação*: {escape_markdown(anotacao_obj.texto)}\n\n'
+            )
 
         await update.message.reply_text(
-            mensagem, parse_mode=ParseMode.MARKDOWN_V2
+            ''.join(partes), parse_mode=ParseMode.MARKDOWN_V2
         )
     except Exception as e:
         logger.exception(f'Erro ao listar anotações: {str(e)}')
@@ -3,6 +3,7 @@ Handlers para comandos de busca de endereços.
 """
 
 import logging
+from itertools import chain
 from typing import Any, Dict, Optional
 
 from telegram import Update
@@ -13,7 +14,7 @@ from ..config import ITENS_POR_PAGINA
 from ..formatters.base import escape_markdown
 from ..formatters.endereco import (
     formatar_endereco,
-    formatar_lista_resultados,
+    iterar_lista_resultados,
 )
 from ..keyboards import (
     criar_teclado_acoes_endereco,  # Adicionado
@@ -21,14 +22,41 @@ from ..keyboards import (
     criar_teclado_resultados_combinado,
 )
 from ..services.endereco import (
+    FiltrosEndereco,
     buscar_endereco,
     buscar_por_coordenadas,
     buscar_por_operadora,  # novo import
+    obter_id_operadora,
     registrar_busca,
 )
+from ..shared.sessao import substituir_resultados
 
 logger = logging.getLogger(__name__)
 
+# Mensagens fixas, já escapadas para MarkdownV2
+_MSG_ERRO_IDENTIDADE = (
+    '😞 Ocorreu um erro ao processar sua identidade\\. '
+    'Por favor, tente novamente mais tarde\\.'
+)
+_MSG_BUSCANDO = '🔍 Buscando endereços, aguarde\\.\\.\\.'
+_MSG_BUSCANDO_OPERADORA = (
+    '🔍 Buscando endereços por id da operadora, aguarde\\.\\.\\.'
+)
+_MSG_NENHUM_ENDERECO = (
+    '😕 Nenhum endereço encontrado para os critérios informados\\.'
+)
+_MSG_NENHUM_ENDERECO_OPERADORA = (
+    '😕 Nenhum endereço encontrado para a operadora informada\\.'
+)
+_MSG_ERRO_BUSCA = (
+    '😞 Ocorreu um erro ao processar sua busca\\. '
+    'Por favor, tente novamente mais tarde\\.'
+)
+_MSG_ERRO_BUSCA_OPERADORA = (
+    '😞 Ocorreu um erro ao buscar endereços da operadora\\. '
+    'Por favor, tente novamente mais tarde\\.'
+)
+
 
 async def buscar_command(
     update: Update, context: ContextTypes.DEFAULT_TYPE
@@ -210,13 +238,38 @@ def _extrair_lista_enderecos(resultados):
     return None
 
 
+async def _montar_filtros(
+    params_busca: Dict[str, Any], user_id_telegram: int
+) -> Optional[FiltrosEndereco]:
+    """
+    Traduz os critérios da busca para os filtros da listagem da API.
+
+    A operadora chega pelo nome e vai para a API pelo ID; se ela não for
+    encontrada, retorna None, pois nenhum endereço atende ao critério.
+    """
+    operadora_id = None
+    if params_busca.get('operadora'):
+        operadora_id = await obter_id_operadora(
+            params_busca['operadora'], user_id=user_id_telegram
+        )
+        if operadora_id is None:
+            return None
+    return FiltrosEndereco(
+        query=params_busca.get('query'),
+        municipio=params_busca.get('municipio'),
+        uf=params_busca.get('uf'),
+        cep=params_busca.get('cep'),
+        tipo=params_busca.get('tipo'),
+        operadora_id=operadora_id,
+    )
+
+
 def _responder_erro_identidade(update):
     logger.error(
         'Não foi possível obter effective_user no handler _processar_busca.'
     )
-    return update.message.reply_text(
-        '😞 Ocorreu um erro ao processar sua identidade\\. '
-        'Por favor, tente novamente mais tarde\\.'
+    return update.effective_message.reply_text(
+        _MSG_ERRO_IDENTIDADE, parse_mode=ParseMode.MARKDOWN_V2
     )
 
 
@@ -244,8 +297,8 @@ async def _processar_resultado_unico(
     """Processa e responde quando há um único resultado de busca."""
     mensagem = formatar_endereco(endereco)
     id_endereco_atual = endereco.get('id')
-    logger.info(f'Resultado único. Endereço: {endereco}')
-    logger.info(f'ID do endereço atual: {id_endereco_atual}')
+    logger.info('Resultado único. Endereço: %s', endereco)
+    logger.info('ID do endereço atual: %s', id_endereco_atual)
 
     if user_id_telegram and id_endereco_atual:
         info_adicional = (
@@ -261,11 +314,13 @@ async def _processar_resultado_unico(
 
     reply_markup = None
     if id_endereco_atual:
-        logger.info(f'Criando teclado de ações para o ID: {id_endereco_atual}')
+        logger.info(
+            'Criando teclado de ações para o ID: %s', id_endereco_atual
+        )
         reply_markup = criar_teclado_acoes_endereco(
             id_endereco=id_endereco_atual
         )
-        logger.info(f'Teclado de ações criado: {reply_markup}')
+        logger.info('Teclado de ações criado: %s', reply_markup)
     else:
         logger.warning(
             'ID do endereço não encontrado. Teclado de ações não será exibido.'
@@ -274,7 +329,7 @@ async def _processar_resultado_unico(
             'Nenhum teclado de ação será exibido para resultado único sem ID.'
         )
 
-    await update.message.reply_text(
+    await update.effective_message.reply_text(
         mensagem,
         parse_mode=ParseMode.MARKDOWN_V2,
         reply_markup=reply_markup,
@@ -290,18 +345,22 @@ async def _processar_multiplos_resultados(
     """Processa e responde quando há múltiplos resultados de busca."""
     total_resultados = len(lista)
     logger.info(
-        f'Múltiplos resultados: {total_resultados}. '
-        'Criando teclado de resultados combinado.'
+        'Múltiplos resultados: %s. Criando teclado de resultados combinado.',
+        total_resultados,
     )
     total_paginas = (
         total_resultados + ITENS_POR_PAGINA - 1
     ) // ITENS_POR_PAGINA
     itens_pagina = lista[:ITENS_POR_PAGINA]
-    mensagem = (
-        f'🏢 *Encontrados {escape_markdown(str(total_resultados))} '
-        f'endereços*\n\n'
-        + formatar_lista_resultados(
-            itens_pagina, 0, total_paginas, formatar_endereco
+    mensagem = ''.join(
+        chain(
+            (
+                f'🏢 *Encontrados {escape_markdown(str(total_resultados))} '
+                'endereços*\n\n',
+            ),
+            iterar_lista_resultados(
+                itens_pagina, 0, total_paginas, formatar_endereco
+            ),
         )
     )
     if user_id_telegram:
@@ -310,9 +369,9 @@ async def _processar_multiplos_resultados(
     reply_markup = criar_teclado_resultados_combinado(
         pagina_atual=0, total_resultados=total_resultados
     )
-    logger.info(f'Teclado de resultados combinado criado: {reply_markup}')
+    logger.info('Teclado de resultados combinado criado: %s', reply_markup)
 
-    await update.message.reply_text(
+    await update.effective_message.reply_text(
         mensagem,
         parse_mode=ParseMode.MARKDOWN_V2,
         reply_markup=reply_markup,
@@ -336,8 +395,8 @@ async def _processar_busca(
             return
         user_id_telegram = update.effective_user.id
 
-        await update.message.reply_text(
-            '🔍 Buscando endereços, aguarde\\.\\.\\.'
+        await update.effective_message.reply_text(
+            _MSG_BUSCANDO, parse_mode=ParseMode.MARKDOWN_V2
         )
 
         params_busca = params_busca or {}
@@ -350,31 +409,32 @@ async def _processar_busca(
                 latitude, longitude, user_id=user_id_telegram
             )
         else:
-            resultados = await buscar_endereco(
-                query=params_busca.get('query'),
-                id_endereco=id_endereco_param,
-                cep=params_busca.get('cep'),
-                municipio=params_busca.get('municipio'),
-                uf=params_busca.get('uf'),
-                operadora_id=None,  # Adicionado para clareza
-                user_id=user_id_telegram,
-            )
+            # Critérios e filtros seguem juntos para a API, que os aplica
+            # na consulta em vez de filtrarmos a lista aqui no bot
+            filtros = await _montar_filtros(params_busca, user_id_telegram)
+            resultados = []
+            if filtros is not None:
+                resultados = await buscar_endereco(
+                    filtros,
+                    id_endereco=id_endereco_param,
+                    user_id=user_id_telegram,
+                )
 
-        logger.debug(
-            'Tipo de resultados: %s; Conteúdo: %s',
-            type(resultados),
-            str(resultados)[:500],
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                'Tipo de resultados: %s; Conteúdo: %s',
+                type(resultados),
+                str(resultados)[:500],
+            )
 
         lista = _extrair_lista_enderecos(resultados)
         if not lista:
-            await update.message.reply_text(
-                '😕 Nenhum endereço encontrado para os critérios informados\\.'
+            await update.effective_message.reply_text(
+                _MSG_NENHUM_ENDERECO, parse_mode=ParseMode.MARKDOWN_V2
             )
             return
 
-        context.user_data['resultados_busca'] = lista
-        context.user_data['pagina_atual'] = 0
+        substituir_resultados(context.user_data, lista, params_busca)
 
         if len(lista) == 1:
             await _processar_resultado_unico(
@@ -393,9 +453,8 @@ async def _processar_busca(
         logger.error(
             'Erro ao processar busca: %s (tipo: %s)', e, type(e).__name__
         )
-        await update.message.reply_text(
-            '😞 Ocorreu um erro ao processar sua busca\\. '
-            'Por favor, tente novamente mais tarde\\.'
+        await update.effective_message.reply_text(
+            _MSG_ERRO_BUSCA, parse_mode=ParseMode.MARKDOWN_V2
         )
 
 
@@ -415,31 +474,34 @@ async def _processar_busca_operadora(
                 ' _processar_busca_operadora.'
             )
             await update.message.reply_text(
-                '😞 Ocorreu um erro ao processar sua identidade\\. '
-                'Por favor, tente novamente mais tarde\\.'
+                _MSG_ERRO_IDENTIDADE, parse_mode=ParseMode.MARKDOWN_V2
             )
             return
         user_id_telegram = update.effective_user.id
 
         await update.message.reply_text(
-            '🔍 Buscando endereços por id da operadora, aguarde\\.\\.\\.'
+            _MSG_BUSCANDO_OPERADORA, parse_mode=ParseMode.MARKDOWN_V2
         )
         resultados = await buscar_por_operadora(
             codigo_operadora, user_id=user_id_telegram
         )
-        logger.debug(
-            'Tipo de resultados: %s; Conteúdo: %s',
-            type(resultados),
-            str(resultados)[:500],
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                'Tipo de resultados: %s; Conteúdo: %s',
+                type(resultados),
+                str(resultados)[:500],
+            )
         lista = _extrair_lista_enderecos(resultados)
         if not lista:
             await update.message.reply_text(
-                '😕 Nenhum endereço encontrado para a operadora informada\\.'
+                _MSG_NENHUM_ENDERECO_OPERADORA,
+                parse_mode=ParseMode.MARKDOWN_V2,
             )
             return
-        context.user_data['resultados_busca'] = lista
-        context.user_data['pagina_atual'] = 0
+        # Busca por código do site na operadora, não pela operadora
+        substituir_resultados(
+            context.user_data, lista, {'codigo_operadora': codigo_operadora}
+        )
         total_resultados = len(lista)
 
         reply_markup = None  # Inicializa reply_markup
@@ -449,9 +511,9 @@ async def _processar_busca_operadora(
             endereco = lista[0]
             mensagem = formatar_endereco(endereco)
             id_endereco_atual = endereco.get('id')
-            logger.info(f'Resultado único (operadora). Endereço: {endereco}')
+            logger.info('Resultado único (operadora). Endereço: %s', endereco)
             logger.info(
-                f'ID do endereço atual (operadora): {id_endereco_atual}'
+                'ID do endereço atual (operadora): %s', id_endereco_atual
             )
 
             if user_id_telegram and id_endereco_atual:
@@ -468,14 +530,14 @@ async def _processar_busca_operadora(
 
             if id_endereco_atual:
                 logger.info(
-                    'Criando teclado de ações para o ID (operadora): '
-                    f'{id_endereco_atual}'
+                    'Criando teclado de ações para o ID (operadora): %s',
+                    id_endereco_atual,
                 )
                 reply_markup = criar_teclado_acoes_endereco(
                     id_endereco=id_endereco_atual
                 )
                 logger.info(
-                    f'Teclado de ações criado (operadora): {reply_markup}'
+                    'Teclado de ações criado (operadora): %s', reply_markup
                 )
             else:
                 logger.warning(
@@ -488,18 +550,25 @@ async def _processar_busca_operadora(
                 )
         else:  # Múltiplos resultados
             logger.info(
-                f'Múltiplos resultados (operadora): {total_resultados}. '
-                'Criando teclado de resultados combinado.'
+                'Múltiplos resultados (operadora): %s. '
+                'Criando teclado de resultados combinado.',
+                total_resultados,
             )
             total_paginas = (
                 total_resultados + ITENS_POR_PAGINA - 1
             ) // ITENS_POR_PAGINA
             itens_pagina = lista[:ITENS_POR_PAGINA]
-            mensagem = (
-                f'🏢 *Encontrados {escape_markdown(str(total_resultados))} '
-                f'endereços da operadora*\n\n'
-            ) + formatar_lista_resultados(
-                itens_pagina, 0, total_paginas, formatar_endereco
+            mensagem = ''.join(
+                chain(
+                    (
+                        '🏢 *Encontrados '
+                        f'{escape_markdown(str(total_resultados))} '
+                        'endereços da operadora*\n\n',
+                    ),
+                    iterar_lista_resultados(
+                        itens_pagina, 0, total_paginas, formatar_endereco
+                    ),
+                )
             )
             if user_id_telegram:
                 await _registrar_busca_para_lista(
@@ -509,8 +578,8 @@ async def _processar_busca_operadora(
                 pagina_atual=0, total_resultados=total_resultados
             )
             logger.info(
-                'Teclado de resultados combinado criado (operadora): '
-                f'{reply_markup}'
+                'Teclado de resultados combinado criado (operadora): %s',
+                reply_markup,
             )
 
         await update.message.reply_text(
@@ -519,13 +588,12 @@ async def _processar_busca_operadora(
             reply_markup=reply_markup,
         )
         logger.info(
-            f'Mensagem enviada com reply_markup (operadora): {reply_markup}'
+            'Mensagem enviada com reply_markup (operadora): %s', reply_markup
         )
     except Exception as e:
         logger.error(
             'Erro ao buscar por operadora: %s (tipo: %s)', e, type(e).__name__
         )
         await update.message.reply_text(
-            '😞 Ocorreu um erro ao buscar endereços da operadora\\. '
-            'Por favor, tente novamente mais tarde\\.'
+            _MSG_ERRO_BUSCA_OPERADORA, parse_mode=ParseMode.MARKDOWN_V2
         )
@@ -4,12 +4,15 @@ Implementa o fluxo de busca direta por diferentes tipos de código.
 """
 
 import logging
-from typing import Any, Dict, List
+import re
+from types import MappingProxyType
+from typing import Any, Awaitable, Callable, Dict, List
 
 from telegram import (
     CallbackQuery,
     InlineKeyboardButton,
     InlineKeyboardMarkup,
+    Message,
     Update,
 )
 from telegram.constants import ParseMode
@@ -36,6 +39,11 @@ from ..services.auth import (
 )
 from ..services.endereco import buscar_endereco_por_codigo
 from ..services.usuario import obter_ou_criar_usuario
+from ..shared.sessao import (
+    limpar_resultados,
+    obter_caches,
+    substituir_resultados,
+)
 from ..shared.types import AGUARDANDO_CODIGO, SELECIONANDO_TIPO_CODIGO
 from .endereco_visualizacao import (
     exibir_endereco_completo,
@@ -64,37 +72,94 @@ async def buscar_por_codigo(
 MAX_RESULTADOS_MULTIPLOS_EXIBICAO = 5
 MAX_DESC_CURTA_LEN = 50
 
+# Caracteres especiais do MarkdownV2, removidos numa única passada
+_MARKDOWN_V2_SPECIALS = '*_`\\[]()~>#+-=|{}.!'
+_MD_STRIP_TABLE = str.maketrans('', '', _MARKDOWN_V2_SPECIALS)
+
+# Trechos estáticos já escapados para MarkdownV2
+_ESC_DOT = escape_markdown('.')
+_ESC_SLASH_START = escape_markdown('/start')
+_MSG_ERRO_AUTENTICACAO_INESPERADO = (
+    f'😞 Ocorreu um erro inesperado durante a autenticação{_ESC_DOT}\n'
+    f'Tente novamente mais tarde{_ESC_DOT}'
+)
+
+# Prefixo dos callbacks de seleção entre múltiplos resultados
+_SELECT_MULTI_PREFIX = 'select_multi_'
+
+# Chaves de user_data descartadas ao cancelar a busca
+_CHAVES_BUSCA = (
+    'tipo_codigo_selecionado',
+    'nome_tipo_codigo',
+    'codigo_para_processar',
+)
+
+# Teclados e textos estáticos, construídos uma única vez na importação
+_TECLADO_TIPOS_CODIGO = criar_teclado_tipos_codigo()
+_TECLADO_CANCELAR_BUSCA = InlineKeyboardMarkup([
+    [InlineKeyboardButton('🚫 Cancelar', callback_data='cancelar_busca')]
+])
+_MENSAGEM_MENU_BUSCA = (
+    '🔍 *Busca Rápida por Código*\n\n'
+    'Qual tipo de código você gostaria de usar para a busca?\n\n'
+    '📱 *Código da Operadora*\n   Ex: 12345\n\n'
+    '🏢 *Código da Detentora*\n   Ex: DT001\n\n'
+    '🆔 *ID do Sistema*\n   Ex: 987654'
+)
+
+# Mapear tipos de código (callback_data -> informações do tipo)
+_TIPOS_CODIGO = MappingProxyType({
+    'tipo_cod_operadora': {
+        'nome': 'Código da Operadora',
+        'tipo': 'cod_operadora',
+        'exemplo': '12345',
+    },
+    'tipo_cod_detentora': {
+        'nome': 'Código da Detentora',
+        'tipo': 'cod_detentora',
+        'exemplo': 'DT001',
+    },
+    'tipo_id_sistema': {
+        'nome': 'ID do Sistema',
+        'tipo': 'id_sistema',
+        'exemplo': '987654',
+    },
+})
+
+
+def _montar_prompt_tipo(tipo_info: Dict[str, str]) -> str:
+    """Monta a mensagem MarkdownV2 que pede o código do tipo informado."""
+    tipo_nome_lower = escape_markdown(tipo_info['nome'].lower())
+    return (
+        f'📝 *{escape_markdown(tipo_info["nome"])}*\n\n'
+        f'Por favor, me envie o *{tipo_nome_lower}*{_ESC_DOT}\n\n'
+        f'*Exemplo:* `{tipo_info["exemplo"]}`\n\n'
+        f'*Dica:* Você pode digitar apenas'
+        f' o código ou usar `/cancelar` para voltar{_ESC_DOT}'
+    )
+
+
+# Mensagens por tipo pré-renderizadas: só existem três opções possíveis
+_PROMPT_POR_TIPO = MappingProxyType({
+    data: (tipo_info, _montar_prompt_tipo(tipo_info))
+    for data, tipo_info in _TIPOS_CODIGO.items()
+})
+
+# Classifica o callback da seleção de tipo numa única passada: volta ao
+# menu principal ou um dos tipos de código conhecidos.
+_CB_TIPO_CODIGO_RE = re.compile(
+    r'^(?:(?P<voltar>voltar_menu_principal)|(?P<tipo>'
+    + '|'.join(map(re.escape, _TIPOS_CODIGO))
+    + r'))$'
+)
+
 
 # Funções auxiliares
 
 
 def _limpar_formatacao_markdown(texto: str) -> str:
     """Remove todos os caracteres especiais do MarkdownV2 para fallback."""
-    caracteres_especiais = [
-        '*',
-        '_',
-        '`',
-        '\\',
-        '[',
-        ']',
-        '(',
-        ')',
-        '~',
-        '>',
-        '#',
-        '+',
-        '-',
-        '=',
-        '|',
-        '{',
-        '}',
-        '.',
-        '!',
-    ]
-    texto_limpo = texto
-    for char in caracteres_especiais:
-        texto_limpo = texto_limpo.replace(char, '')
-    return texto_limpo
+    return texto.translate(_MD_STRIP_TABLE)
 
 
 async def _lidar_com_erro_autenticacao(
@@ -104,71 +169,54 @@ async def _lidar_com_erro_autenticacao(
     query: Any = None,
     show_alert_query: bool = True,
 ) -> None:
-    """Lida com o envio de mensagens de erro de autenticação."""
+    """
+    Lida com o envio de mensagens de erro de autenticação.
+
+    Tenta as formas de envio em ordem (MarkdownV2, texto simples e, para
+    callbacks, nova mensagem no chat) e para na primeira que funcionar.
+    """
+    mensagem_simples = _limpar_formatacao_markdown(mensagem_erro)
     if query:
         await query.answer(
             'Falha na autenticação.' if show_alert_query else None,
             show_alert=show_alert_query,
         )
-        try:
-            await query.edit_message_text(
+        tentativas = [
+            lambda: query.edit_message_text(
                 mensagem_erro, parse_mode=ParseMode.MARKDOWN_V2
+            ),
+            lambda: query.edit_message_text(mensagem_simples),
+        ]
+        if update.effective_chat:
+            chat_id = update.effective_chat.id
+            tentativas.append(
+                lambda: context.bot.send_message(chat_id, mensagem_simples)
             )
-        except Exception as e:
-            logger.warning(
-                'Falha ao editar msg do query em'
-                ' _lidar_com_erro_autenticacao: %s',
-                e,
-            )
-            # Fallback: tentar enviar sem formatação
-            try:
-                # Remove todos os caracteres especiais do MarkdownV2
-                mensagem_simples = _limpar_formatacao_markdown(mensagem_erro)
-                await query.edit_message_text(mensagem_simples)
-            except Exception as e2:
-                logger.warning(
-                    'Falha no fallback de edição'
-                    ' em _lidar_com_erro_autenticacao: %s',
-                    e2,
-                )
-                # Último recurso: enviar nova mensagem
-                if update.effective_chat:
-                    try:
-                        mensagem_simples = _limpar_formatacao_markdown(
-                            mensagem_erro
-                        )
-                        await context.bot.send_message(
-                            update.effective_chat.id,
-                            mensagem_simples,
-                        )
-                    except Exception as e3:
-                        logger.error(
-                            'Falha crítica ao enviar mensagem de erro em'
-                            ' _lidar_com_erro_autenticacao: %s',
-                            e3,
-                        )
     elif update.effective_message:
-        try:
-            await update.effective_message.reply_text(
+        mensagem = update.effective_message
+        tentativas = [
+            lambda: mensagem.reply_text(
                 mensagem_erro, parse_mode=ParseMode.MARKDOWN_V2
-            )
+            ),
+            lambda: mensagem.reply_text(mensagem_simples),
+        ]
+    else:
+        return
+
+    for tentativa in tentativas:
+        try:
+            await tentativa()
+            return
         except Exception as e:
             logger.warning(
-                'Falha ao enviar reply com markdown em'
+                'Falha ao enviar msg de erro em'
                 ' _lidar_com_erro_autenticacao: %s',
                 e,
             )
-            # Fallback: enviar sem formatação
-            try:
-                # Remove todos os caracteres especiais do MarkdownV2
-                mensagem_simples = _limpar_formatacao_markdown(mensagem_erro)
-                await update.effective_message.reply_text(mensagem_simples)
-            except Exception as e2:
-                logger.error(
-                    'Falha crítica no fallback de reply em'
-                    ' _lidar_com_erro_autenticacao: %s',
-                    e2,
-                )
+    logger.error(
+        'Falha crítica ao enviar mensagem de erro em'
+        ' _lidar_com_erro_autenticacao: nenhuma tentativa funcionou.'
+    )
 
 
 async def _autenticar_usuario_para_busca(
@@ -190,7 +238,7 @@ async def _autenticar_usuario_para_busca(
         mensagem_erro_usr = 'Erro: Não foi possível identificar o usuário.'
         if query:
             await query.answer(mensagem_erro_usr, show_alert=True)
-            exibir_menu_principal_func = context.application.bot_data.get(
+            exibir_menu_principal_func = context.bot_data.get(
                 'exibir_menu_principal_func'
             )
             if exibir_menu_principal_func:
@@ -213,7 +261,7 @@ async def _autenticar_usuario_para_busca(
         return False
 
     try:
-        logger.info(f'Autenticando usuário {user.id} para busca.')
+        logger.info('Autenticando usuário %s para busca.', user.id)
         # Obter a sessão do banco de dados usando get_async_session
         async with get_async_session() as async_session:  # Corrigido
             dados_usuario_api, _ = await obter_ou_criar_usuario(
@@ -231,24 +279,25 @@ async def _autenticar_usuario_para_busca(
                 dados_usuario_api.telegram_user_id
             )
             logger.info(
-                f'Usuário autenticado para busca: id='
-                f'{context.user_data.get("usuario_id")}, '
-                f'telegram_id={context.user_data.get("user_id_telegram")}'
+                'Usuário autenticado para busca: id=%s, telegram_id=%s',
+                context.user_data.get('usuario_id'),
+                context.user_data.get('user_id_telegram'),
             )
             return True
         # Se dados_usuario_api for um dict (resposta da API antiga ou erro)
         elif (
             isinstance(dados_usuario_api, dict)
-            and 'error' not in dados_usuario_api
+            and dados_usuario_api.get('error') is None
         ):
             context.user_data['usuario_id'] = dados_usuario_api.get('id')
             context.user_data['user_id_telegram'] = dados_usuario_api.get(
                 'telegram_user_id', user.id
             )
             logger.info(
-                f'Usuário autenticado para busca (dict): id='
-                f'{context.user_data.get("usuario_id")}, '
-                f'telegram_id={context.user_data.get("user_id_telegram")}'
+                'Usuário autenticado para busca (dict): id=%s, '
+                'telegram_id=%s',
+                context.user_data.get('usuario_id'),
+                context.user_data.get('user_id_telegram'),
             )
             return True
         else:  # Erro ou None
@@ -258,14 +307,15 @@ async def _autenticar_usuario_para_busca(
                 else 'Resposta None ou inesperada da API'
             )
             logger.error(
-                f'Falha na autenticação para busca (usuário {user.id}): '
-                f'{error_detail}'
+                'Falha na autenticação para busca (usuário %s): %s',
+                user.id,
+                error_detail,
             )
             msg_erro_auth = (
                 f'😞 Falha na autenticação: {
                     escape_markdown(str(error_detail))
-                }{escape_markdown(".")} '
-                f'Tente {escape_markdown("/start")}{escape_markdown(".")}'
+                }{_ESC_DOT} '
+                f'Tente {_ESC_SLASH_START}{_ESC_DOT}'
             )
             await _lidar_com_erro_autenticacao(
                 update, context, msg_erro_auth, query
@@ -273,15 +323,12 @@ async def _autenticar_usuario_para_busca(
             return False
     except Exception as e:
         logger.exception(
-            f'Exceção durante autenticação para busca (usuário {user.id}): {e}'
-        )
-        msg_erro_exc = (
-            f'😞 Ocorreu um erro inesperado durante a autenticação'
-            f'{escape_markdown(".")}\n'
-            f'Tente novamente mais tarde{escape_markdown(".")}'
+            'Exceção durante autenticação para busca (usuário %s): %s',
+            user.id,
+            e,
         )
         await _lidar_com_erro_autenticacao(
-            update, context, msg_erro_exc, query
+            update, context, _MSG_ERRO_AUTENTICACAO_INESPERADO, query
         )
         return False
 
@@ -345,20 +392,8 @@ async def iniciar_busca_rapida(
     if query:
         await query.answer()  # Responder ao callback
 
-    mensagem_texto = (
-        '🔍 *Busca Rápida por Código*\n\n'
-        'Qual tipo de código você gostaria de usar para a busca?\n\n'
-        '📱 *Código da Operadora*\n'
-        '   Ex: 12345\n\n'
-        '🏢 *Código da Detentora*\n'
-        '   Ex: DT001\n\n'
-        '🆔 *ID do Sistema*\n'
-        '   Ex: 987654'
-    )
-    teclado = criar_teclado_tipos_codigo()
-
     if await _enviar_ou_editar_mensagem_busca_rapida(
-        update, context, mensagem_texto, teclado
+        update, context, _MENSAGEM_MENU_BUSCA, _TECLADO_TIPOS_CODIGO
     ):
         return SELECIONANDO_TIPO_CODIGO
     else:
@@ -394,34 +429,21 @@ async def selecionar_tipo_codigo(
 
     await query.answer()
     data = query.data
-    logger.info(f'[selecionar_tipo_codigo] Callback data: {data}')
+    logger.info('[selecionar_tipo_codigo] Callback data: %s', data)
     logger.info(
         '[selecionar_tipo_codigo] Estado atual da conversa '
         '(antes do processamento)'
     )
 
-    # Mapear tipos de código
-    tipos_codigo = {
-        'tipo_cod_operadora': {
-            'nome': 'Código da Operadora',
-            'tipo': 'cod_operadora',
-            'exemplo': '12345',
-        },
-        'tipo_cod_detentora': {
-            'nome': 'Código da Detentora',
-            'tipo': 'cod_detentora',
-            'exemplo': 'DT001',
-        },
-        'tipo_id_sistema': {
-            'nome': 'ID do Sistema',
-            'tipo': 'id_sistema',
-            'exemplo': '987654',
-        },
-    }
-
-    if data == 'voltar_menu_principal':
+    match = _CB_TIPO_CODIGO_RE.match(data or '')
+    if match is None:
+        logger.error('[selecionar_tipo_codigo] Dados inválidos: %s', data)
+        await query.edit_message_text('😞 Opção inválida. Tente novamente.')
+        return ConversationHandler.END
+
+    if match['voltar']:
         logger.info('[selecionar_tipo_codigo] Voltando ao menu principal')
-        exibir_menu_principal_func = context.application.bot_data.get(
+        exibir_menu_principal_func = context.bot_data.get(
             'exibir_menu_principal_func'
         )
         if exibir_menu_principal_func:
@@ -435,34 +457,16 @@ async def selecionar_tipo_codigo(
             )
         return ConversationHandler.END
 
-    if data not in tipos_codigo:
-        logger.error(f'[selecionar_tipo_codigo] Dados inválidos: {data}')
-        await query.edit_message_text('😞 Opção inválida. Tente novamente.')
-        return ConversationHandler.END
-
-    tipo_info = tipos_codigo[data]
-    logger.info(f'[selecionar_tipo_codigo] Tipo selecionado: {tipo_info}')
+    tipo_info, mensagem = _PROMPT_POR_TIPO[match['tipo']]
+    logger.info('[selecionar_tipo_codigo] Tipo selecionado: %s', tipo_info)
     context.user_data['tipo_codigo_selecionado'] = tipo_info['tipo']
     context.user_data['nome_tipo_codigo'] = tipo_info['nome']
 
-    tipo_nome_lower = escape_markdown(tipo_info['nome'].lower())
-    mensagem = (
-        f'📝 *{escape_markdown(tipo_info["nome"])}*\n\n'
-        f'Por favor, me envie o *{tipo_nome_lower}*{escape_markdown(".")}\n\n'
-        f'*Exemplo:* `{tipo_info["exemplo"]}`\n\n'
-        f'*Dica:* Você pode digitar apenas'
-        f' o código ou usar `/cancelar` para voltar{escape_markdown(".")}'
-    )
-
-    keyboard = InlineKeyboardMarkup([
-        [InlineKeyboardButton('🚫 Cancelar', callback_data='cancelar_busca')]
-    ])
-
     try:
         await query.edit_message_text(
             text=mensagem,
             parse_mode=ParseMode.MARKDOWN_V2,
-            reply_markup=keyboard,
+            reply_markup=_TECLADO_CANCELAR_BUSCA,
         )
         logger.info(
             '[selecionar_tipo_codigo] Mensagem editada com sucesso, '
@@ -471,7 +475,7 @@ async def selecionar_tipo_codigo(
         return AGUARDANDO_CODIGO
 
     except Exception as e:
-        logger.error(f'Erro ao selecionar tipo de código: {str(e)}')
+        logger.error('Erro ao selecionar tipo de código: %s', e)
         await query.edit_message_text('😞 Ocorreu um erro. Tente novamente.')
         return ConversationHandler.END
 
@@ -515,16 +519,30 @@ async def _validar_entrada_e_obter_codigo_tipo(
     return codigo, tipo_codigo, nome_tipo
 
 
-async def _enviar_acao_digitando(
+def _reply_target(update: Update) -> Message | None:
+    """Mensagem alvo para respostas: a do update ou a do callback."""
+    return update.effective_message or (
+        update.callback_query.message if update.callback_query else None
+    )
+
+
+def _enviar_acao_digitando(
     update: Update, context: ContextTypes.DEFAULT_TYPE
 ) -> None:
-    """Envia a ação 'typing' se houver um alvo de mensagem."""
-    target_for_typing = update.effective_message or (
-        update.callback_query and update.callback_query.message
-    )
+    """
+    Agenda a ação 'typing' se houver um alvo de mensagem.
+
+    O indicador não influencia a busca, então é enviado em background
+    em vez de atrasar a consulta em um round-trip do Telegram. A task
+    fica com a Application, que registra eventuais erros.
+    """
+    target_for_typing = _reply_target(update)
     if target_for_typing:
-        await context.bot.send_chat_action(
-            chat_id=target_for_typing.chat_id, action='typing'
+        context.application.create_task(
+            context.bot.send_chat_action(
+                chat_id=target_for_typing.chat_id, action='typing'
+            ),
+            update=update,
         )
     else:
         logger.warning(
@@ -532,6 +550,13 @@ async def _enviar_acao_digitando(
         )
 
 
+def _indexar_resultados(
+    resultados: List[Dict[str, Any]],
+) -> Dict[str, Dict[str, Any]]:
+    """Indexa os resultados pelo ID usado nos callbacks de seleção."""
+    return {str(r.get('id_sistema') or r.get('id')): r for r in resultados}
+
+
 async def _processar_resultados_busca(
     update: Update,
     context: ContextTypes.DEFAULT_TYPE,
@@ -540,14 +565,12 @@ async def _processar_resultados_busca(
     nome_tipo: str,
 ) -> int:
     """Processa os resultados da busca e envia a resposta apropriada."""
-    logger.info(
-        f'DEBUG: _processar_resultados_busca - Resultados recebidos: {
-            resultados
-        }'
-    )
-    target_message_for_reply = update.effective_message
-    if not target_message_for_reply and update.callback_query:
-        target_message_for_reply = update.callback_query.message
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            '_processar_resultados_busca - Resultados recebidos: %s',
+            resultados,
+        )
+    target_message_for_reply = _reply_target(update)
 
     if not target_message_for_reply:
         logger.error(
@@ -556,7 +579,8 @@ async def _processar_resultados_busca(
         )
         return ConversationHandler.END
 
-    if not resultados or len(resultados) == 0:
+    total_resultados = len(resultados) if resultados else 0
+    if total_resultados == 0:
         mensagem = (
             f'❌ *Nenhum endereço encontrado*\n\n'
             f'Não encontrei nenhum endereço para o '
@@ -576,7 +600,7 @@ async def _processar_resultados_busca(
         )
         return ConversationHandler.END
 
-    elif len(resultados) == 1:
+    elif total_resultados == 1:
         endereco = resultados[0]
         await exibir_endereco_completo(update, context, endereco)
         return ConversationHandler.END
@@ -609,7 +633,7 @@ async def processar_codigo(
     if nome_tipo is None:
         nome_tipo = 'código'
 
-    await _enviar_acao_digitando(update, context)
+    _enviar_acao_digitando(update, context)
 
     try:
         usuario_id, user_id_telegram = await validar_dados_usuario_contexto(
@@ -620,8 +644,12 @@ async def processar_codigo(
             return ConversationHandler.END
 
         logger.info(
-            f'Buscando endereço. Código: {codigo}, Tipo: {tipo_codigo}, '
-            f'UsuarioID: {usuario_id}, TelegramID: {user_id_telegram}'
+            'Buscando endereço. Código: %s, Tipo: %s, '
+            'UsuarioID: %s, TelegramID: %s',
+            codigo,
+            tipo_codigo,
+            usuario_id,
+            user_id_telegram,
         )
 
         resultados = await buscar_endereco_por_codigo(
@@ -630,10 +658,12 @@ async def processar_codigo(
             usuario_id=usuario_id,
             user_id_telegram=user_id_telegram,
         )
-        logger.info(
-            f'DEBUG: processar_codigo - Resultados da API: {resultados}'
-        )
-        context.user_data['resultados_busca'] = resultados
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                'processar_codigo - Resultados da API: %s', resultados
+            )
+        # O índice de seleção é refeito sob demanda a partir da lista
+        substituir_resultados(context.user_data, resultados)
         context.user_data['codigo_busca'] = codigo
         context.user_data['nome_tipo_busca'] = nome_tipo
 
@@ -643,11 +673,9 @@ async def processar_codigo(
 
     except Exception:
         logger.exception(
-            f'Erro ao processar código {codigo} (tipo: {tipo_codigo})'
+            'Erro ao processar código %s (tipo: %s)', codigo, tipo_codigo
         )
-        target_message_on_error = update.effective_message
-        if not target_message_on_error and update.callback_query:
-            target_message_on_error = update.callback_query.message
+        target_message_on_error = _reply_target(update)
 
         if target_message_on_error:
             await target_message_on_error.reply_text(
@@ -667,26 +695,26 @@ async def _validar_callback_e_obter_id(
         )
         return None
 
-    if not query.data.startswith('select_multi_'):
+    if not query.data.startswith(_SELECT_MULTI_PREFIX):
         logger.warning(
-            f'Callback inválido em _validar_callback_e_obter_id: {query.data}'
+            'Callback inválido em _validar_callback_e_obter_id: %s',
+            query.data,
         )
         await query.edit_message_text(
             'Erro: Seleção inválida.', reply_markup=None
         )
         return None
 
-    try:
-        return query.data.split('_')[-1]
-    except IndexError:
+    id_resultado = query.data[len(_SELECT_MULTI_PREFIX) :]
+    if not id_resultado:
         logger.error(
-            f'ID do resultado inválido no callback (split falhou): '
-            f'{query.data}'
+            'ID do resultado inválido no callback (vazio): %s', query.data
         )
         await query.edit_message_text(
             'Erro: ID do resultado malformado.', reply_markup=None
         )
         return None
+    return id_resultado
 
 
 async def _obter_endereco_selecionado_do_contexto(
@@ -709,20 +737,18 @@ async def _obter_endereco_selecionado_do_contexto(
         )
         return None
 
-    endereco_selecionado = next(
-        (
-            end
-            for end in resultados_busca
-            if str(end.get('id_sistema') or end.get('id'))
-            == id_sistema_selecionado
-        ),
-        None,
-    )
+    caches = obter_caches(context.user_data)
+    indice = caches.get('resultados_index')
+    if indice is None:
+        indice = caches['resultados_index'] = _indexar_resultados(
+            resultados_busca
+        )
+    endereco_selecionado = indice.get(id_sistema_selecionado)
 
     if not endereco_selecionado:
         logger.warning(
-            f'Endereço selecionado (ID: {id_sistema_selecionado}) não '
-            f'encontrado nos resultados.'
+            'Endereço selecionado (ID: %s) não encontrado nos resultados.',
+            id_sistema_selecionado,
         )
         await query.edit_message_text(
             'Desculpe, o endereço selecionado não foi encontrado. '
@@ -764,7 +790,8 @@ async def selecionar_resultado_multiplo_callback(
         await query.delete_message()
     except Exception as e:
         logger.info(
-            f'Não foi possível deletar a mensagem de múltiplos resultados: {e}'
+            'Não foi possível deletar a mensagem de múltiplos resultados: %s',
+            e,
         )
 
     if not await reautenticar_usuario_se_necessario(query, context):
@@ -775,19 +802,10 @@ async def selecionar_resultado_multiplo_callback(
 
 async def _limpar_dados_busca(context: ContextTypes.DEFAULT_TYPE) -> None:
     """Limpa os dados relacionados à busca do user_data."""
-    logger.debug('[cancelar_busca] Iniciando limpeza de context.user_data.')
-    keys_to_remove = [
-        'tipo_codigo_selecionado',
-        'nome_tipo_codigo',
-        'codigo_para_processar',
-        'resultados_busca',
-    ]
-    for key in keys_to_remove:
+    for key in _CHAVES_BUSCA:
         context.user_data.pop(key, None)
-        logger.debug(
-            f"Chave '{key}' removida (se existia) de context.user_data."
-        )
-    logger.debug('[cancelar_busca] Limpeza de context.user_data finalizada.')
+    limpar_resultados(context.user_data)
+    logger.debug('[cancelar_busca] Chaves removidas: %s', _CHAVES_BUSCA)
 
 
 async def cancelar_busca(
@@ -805,50 +823,40 @@ async def cancelar_busca(
 
     await _limpar_dados_busca(context)
 
-    # Texto do menu inicial de busca rápida
-    mensagem_menu = (
-        '🔍 *Busca Rápida por Código*\n\n'
-        'Qual tipo de código você gostaria de usar para a busca?\n\n'
-        '📱 *Código da Operadora*\n   Ex: 12345\n\n'
-        '🏢 *Código da Detentora*\n   Ex: DT001\n\n'
-        '🆔 *ID do Sistema*\n   Ex: 987654'
-    )
-    teclado = criar_teclado_tipos_codigo()
-
     # Editar a mensagem atual em vez de deletar e criar nova
     # Isso mantém a continuidade do ConversationHandler
     if query and query.message:
         try:
             await query.edit_message_text(
-                text=mensagem_menu,
+                text=_MENSAGEM_MENU_BUSCA,
                 parse_mode=ParseMode.MARKDOWN_V2,
-                reply_markup=teclado,
+                reply_markup=_TECLADO_TIPOS_CODIGO,
             )
             logger.info(
                 'Menu de seleção de tipo de código atualizado após '
                 'cancelamento via callback'
             )
         except Exception as e:
-            logger.warning(f'Falha ao editar mensagem: {e}')
+            logger.warning('Falha ao editar mensagem: %s', e)
             # Fallback: enviar nova mensagem apenas se a edição falhar
             try:
                 await query.delete_message()
                 if update.effective_chat:
                     await context.bot.send_message(
                         chat_id=update.effective_chat.id,
-                        text=mensagem_menu,
+                        text=_MENSAGEM_MENU_BUSCA,
                         parse_mode=ParseMode.MARKDOWN_V2,
-                        reply_markup=teclado,
+                        reply_markup=_TECLADO_TIPOS_CODIGO,
                     )
                     logger.info('Nova mensagem enviada após falha na edição')
             except Exception as e2:
-                logger.error(f'Falha crítica no fallback: {e2}')
+                logger.error('Falha crítica no fallback: %s', e2)
     # Comando direto /cancelar ou fallback
     elif update.effective_message:
         await update.effective_message.reply_text(
-            mensagem_menu,
+            _MENSAGEM_MENU_BUSCA,
             parse_mode=ParseMode.MARKDOWN_V2,
-            reply_markup=teclado,
+            reply_markup=_TECLADO_TIPOS_CODIGO,
         )
         logger.info(
             'Menu de seleção de tipo de código enviado via comando direto'
@@ -858,51 +866,34 @@ async def cancelar_busca(
     return SELECIONANDO_TIPO_CODIGO
 
 
-async def comando_cod_operadora(
-    update: Update, context: ContextTypes.DEFAULT_TYPE
-) -> None:
-    """Handler para o comando /cod_operadora."""
-    codigo = context.args[0] if context.args else None
-    if (
-        await autenticar_e_preparar_contexto_comando(update, context)
-        is not None
-    ):
-        logger.info(
-            f'Comando /cod_operadora: código {codigo}. '
-            f'Chamando processar_codigo.'
-        )
-        await processar_codigo(update, context)
+def _criar_handler_comando_codigo(
+    nome: str,
+) -> Callable[[Update, ContextTypes.DEFAULT_TYPE], Awaitable[None]]:
+    """Cria o handler do comando direto /<nome> de busca por código."""
 
+    async def handler(
+        update: Update, context: ContextTypes.DEFAULT_TYPE
+    ) -> None:
+        codigo = context.args[0] if context.args else None
+        if (
+            await autenticar_e_preparar_contexto_comando(update, context)
+            is not None
+        ):
+            logger.info(
+                'Comando /%s: código %s. Chamando processar_codigo.',
+                nome,
+                codigo,
+            )
+            await processar_codigo(update, context)
 
-async def comando_cod_detentora(
-    update: Update, context: ContextTypes.DEFAULT_TYPE
-) -> None:
-    """Handler para o comando /cod_detentora."""
-    codigo = context.args[0] if context.args else None
-    if (
-        await autenticar_e_preparar_contexto_comando(update, context)
-        is not None
-    ):
-        logger.info(
-            f'Comando /cod_detentora: código {codigo}. '
-            f'Chamando processar_codigo.'
-        )
-        await processar_codigo(update, context)
+    handler.__name__ = handler.__qualname__ = f'comando_{nome}'
+    handler.__doc__ = f'Handler para o comando /{nome}.'
+    return handler
 
 
-async def comando_id_sistema(
-    update: Update, context: ContextTypes.DEFAULT_TYPE
-) -> None:
-    """Handler para o comando /id_sistema."""
-    codigo = context.args[0] if context.args else None
-    if (
-        await autenticar_e_preparar_contexto_comando(update, context)
-        is not None
-    ):
-        logger.info(
-            f'Comando /id_sistema: código {codigo}. Chamando processar_codigo.'
-        )
-        await processar_codigo(update, context)
+comando_cod_operadora = _criar_handler_comando_codigo('cod_operadora')
+comando_cod_detentora = _criar_handler_comando_codigo('cod_detentora')
+comando_id_sistema = _criar_handler_comando_codigo('id_sistema')
 
 
 # Handler da Conversa de Busca Rápida (iniciada pelo menu)
@@ -921,7 +912,7 @@ handler_busca_rapida = ConversationHandler(
         SELECIONANDO_TIPO_CODIGO: [
             CallbackQueryHandler(
                 selecionar_tipo_codigo,
-                pattern='^(tipo_cod_operadora|tipo_cod_detentora|tipo_id_sistema|voltar_menu_principal)$',
+                pattern=_CB_TIPO_CODIGO_RE,
             ),
             CallbackQueryHandler(cancelar_busca, pattern='^cancelar_busca$'),
         ],
@@ -2,17 +2,18 @@
 Handlers para callbacks de botões inline.
 """
 
+import asyncio
 import logging
-import re
+from functools import lru_cache, partial
+from itertools import chain
+from typing import Callable
 
-from telegram import Update
+from telegram import CallbackQuery, InlineKeyboardMarkup, Update
 from telegram.constants import ParseMode
+from telegram.error import BadRequest, NetworkError, TelegramError
 from telegram.ext import ContextTypes
 
 from ..config import ITENS_POR_PAGINA
-
-# formatar_endereco não é usado diretamente neste arquivo.
-# Se formatar_lista_resultados for auto-suficiente, pode ser removido.
 from ..formatters.anotacao import (
     filtrar_anotacoes_por_privilegio,
     formatar_anotacoes_para_exibicao,
@@ -20,7 +21,7 @@ from ..formatters.anotacao import (
 from ..formatters.base import escape_markdown
 from ..formatters.endereco import (
     formatar_endereco,
-    formatar_lista_resultados,
+    iterar_lista_resultados,
 )
 from ..keyboards import (
     criar_teclado_filtros,
@@ -32,12 +33,120 @@ from ..keyboards import (
 )
 from ..services.anotacao import listar_anotacoes  # Adicionado
 from ..services.sugestao import criar_sugestao
+from ..shared.sessao import obter_caches
 
 # Movendo importações para o topo do arquivo
 from .busca import _processar_busca
 
 logger = logging.getLogger(__name__)
 
+# Prefixos de callback cujo sufixo é o parâmetro do handler
+_PREFIXO_PAGINA = 'pagina_'
+_PREFIXO_TIPO = 'tipo_'
+_PREFIXO_LER_ANOTACOES = 'ler_anotacoes_'
+
+# Critérios de busca que a listagem da API combina com os filtros
+_CRITERIOS_FILTRAVEIS = frozenset({
+    'query', 'municipio', 'uf', 'cep', 'tipo', 'operadora',
+})
+
+# Valor padrão imutável para resultados ausentes (evita criar listas)
+_VAZIO = ()
+
+# Espera (em segundos) antes de repetir uma edição que falhou por rede
+_ESPERA_NOVA_TENTATIVA = 1.0
+
+# Páginas formatadas mantidas por usuário (a atual e as vizinhas, com folga)
+_MAX_PAGINAS_EM_CACHE = 8
+
+# Mensagens fixas, já escapadas para MarkdownV2
+_MSG_ERRO_GENERICO = '😕 Erro ao processar\\. Tente novamente\\.'
+_MSG_SEM_RESULTADOS = '😕 Não há resultados para mostrar\\.'
+_MSG_SUGESTAO_ENVIADA = (
+    '✅ Sugestão enviada com sucesso\\! ID: {id}\n'
+    'Nossa equipe irá analisar e responder em breve\\.'
+)
+_MSG_ERRO_SUGESTAO = (
+    '😞 Ocorreu um erro ao enviar sua sugestão\\. '
+    'Por favor, tente novamente mais tarde\\.'
+)
+_MSG_SUGESTAO_INCOMPLETA = (
+    '❌ Dados incompletos para enviar a sugestão\\. '
+    'Por favor, tente novamente\\.'
+)
+_MSG_OPERACAO_CANCELADA = '❌ Operação cancelada\\.'
+_MSG_ERRO_ID_ANOTACOES = (
+    'Erro ao processar o ID do endereço para ler anotações\\.'
+)
+_MSG_SEM_ANOTACOES = (
+    'ℹ️ Nenhuma anotação encontrada para o endereço ID {id}\\.'
+)
+_MSG_ANOTACOES_RESPOSTA_INESPERADA = (
+    'ℹ️ Resposta inesperada ao buscar anotações para o endereço ID {id}\\.'
+)
+_MSG_SEM_ANOTACOES_OU_ERRO = (
+    'ℹ️ Nenhuma anotação encontrada para o endereço ID {id} '
+    'ou ocorreu um erro ao buscar\\.'
+)
+_MSG_FILTRO_INDISPONIVEL = (
+    '😕 Os filtros não se aplicam a esta busca\\. '
+    'Faça uma nova busca por texto, município ou UF para filtrá\\-la\\.'
+)
+_MSG_ERRO_ANOTACOES = (
+    '😞 Ocorreu um erro ao buscar as anotações para o endereço ID {id}\\. '
+    'Por favor, tente novamente mais tarde\\.'
+)
+
+# A API devolve poucos avisos distintos ('detail'/'message'); o texto
+# escapado de cada um é reaproveitado entre requisições
+_escapar_aviso_api = lru_cache(maxsize=256)(escape_markdown)
+
+# Callbacks exatos tratados pelos ConversationHandlers e pelo menu
+# principal; o handler genérico os ignora
+_CALLBACKS_CONVERSA = frozenset({
+    'cancelar_busca', 'anotacao_cancelar_fluxo', 'sugest_cancelar_geral',
+    'tipo_cod_operadora', 'tipo_cod_detentora', 'tipo_id_sistema',
+})
+# Prefixos dos mesmos handlers, do mais longo para o mais curto
+_PREFIXOS_CONVERSA = (
+    'sugestao_endereco_id_',
+    'anotacao_iniciar_id_',
+    'finalizar_anotacao_',
+    'sugest_confirmar_',
+    'select_multi_',
+    'sugest_tipo_',
+    'sugerir_',
+)
+_CALLBACKS_MENU = frozenset({
+    'menu_explorar_base', 'menu_minhas_info', 'menu_ajuda',
+    'voltar_menu_principal', 'explorar_filtrar', 'explorar_proximidade',
+    'minhas_anotacoes', 'fazer_sugestao',
+})
+
+# Tipo de sugestão -> (pergunta ao usuário, campo aguardado em seguida)
+_SUGESTAO_ACOES = {
+    'adicao': (
+        'Por favor, descreva o endereço que deseja adicionar, '
+        'incluindo logradouro, número, bairro, cidade, UF e CEP:',
+        None,
+    ),
+    'modificacao': (
+        'Por favor, informe o ID do endereço que deseja modificar:',
+        'id_endereco_modificacao',
+    ),
+    'remocao': (
+        'Por favor, informe o ID do endereço que deseja remover:',
+        'id_endereco_remocao',
+    ),
+}
+
+# Dados da sugestão em andamento, descartados após o envio
+_CHAVES_SUGESTAO = (
+    'tipo_sugestao',
+    'detalhe_sugestao',
+    'id_endereco_sugestao',
+)
+
 
 # Adicionar helper para escapar MarkdownV2
 async def handle_callback(
@@ -46,180 +155,370 @@ async def handle_callback(
     """
     Handler geral para callbacks de botões inline.
     Direciona para a função específica de acordo com o prefixo.
+
+    O callback é respondido (query.answer) somente aqui; os handlers
+    específicos não devem respondê-lo de novo. Quando a ação depende de
+    resultados que não existem, o aviso vai na própria resposta (um
+    toast) em vez de uma nova mensagem no chat.
     """
     query = update.callback_query
-    await query.answer()
     cb_data = query.data  # Renomeado para cb_data para encurtar linhas
-    resultados_busca = context.user_data.get('resultados_busca', [])
-
-    conv_cbs = {  # Renomeado para encurtar
-        'cancelar_busca', 'anotacao_cancelar_fluxo', 'sugest_cancelar_geral',
-    }
-    conv_prefixes = (  # Renomeado para encurtar
-        'anotacao_iniciar_id_', 'finalizar_anotacao_', 'select_multi_',
-        'sugest_tipo_', 'sugest_confirmar_', 'sugerir_',
-        'sugestao_endereco_id_',
-    )
-    menu_cbs = {  # Renomeado para encurtar
-        "menu_explorar_base", "menu_minhas_info", "menu_ajuda",
-        "voltar_menu_principal", "explorar_filtrar", "explorar_proximidade",
-        "minhas_anotacoes", "fazer_sugestao",
-    }
 
-    logger.debug(f"[HCB] Raw cb: {repr(cb_data)}")  # HCB = handle_callback
-    logger.debug(f"[HCB] Conv. prefixes: {conv_prefixes}")
+    logger.debug('[HCB] Raw cb: %r', cb_data)  # HCB = handle_callback
 
     try:
-        is_conv_cb = cb_data in conv_cbs
-        # Corrigido E501: Quebra da linha do gerador
-        is_conv_pref = any(
-            cb_data.startswith(p) for p in conv_prefixes
-        )
-        is_menu_cb = cb_data in menu_cbs
-
-        for idx, p_val in enumerate(conv_prefixes):
-            starts = cb_data.startswith(p_val)
-            logger.debug(f"[HCB] Pfix #{idx}: {repr(p_val)} -> {starts}")
-
-        log_msg_ch = (
-            f"[HCB] Checks: conv_cb={is_conv_cb}, "
-            f"conv_pref={is_conv_pref}, menu_cb={is_menu_cb}"
-        )
-        logger.debug(log_msg_ch)
-
-        if is_conv_cb or is_conv_pref or is_menu_cb:
-            logger.debug(
-                f"[HCB] Cb {repr(cb_data)} (conv/menu), skip generic."
-            )
+        # startswith com tupla testa todos os prefixos numa só chamada
+        if cb_data.startswith(_PREFIXOS_CONVERSA):
+            await query.answer()
+            logger.debug('[HCB] Cb %r (conv/menu), skip generic.', cb_data)
             return
 
-        logger.info(f"[HCB] GENERIC cb: {cb_data}")
-
-        if cb_data == 'mostrar_filtros':
-            await query.message.reply_text(
-                'Selecione um filtro:', reply_markup=criar_teclado_filtros()
-            )
+        handler = _resolver_handler(cb_data)
+        aviso = _AVISOS_SEM_RESULTADOS.get(handler)
+        if aviso and not context.user_data.get('resultados_busca'):
+            await query.answer(aviso)
             return
+        # Responde em segundo plano para o handler já começar a trabalhar;
+        # a task fica com a Application, que registra eventuais erros
+        context.application.create_task(
+            query.answer(_AVISOS_AO_RESPONDER.get(handler)), update=update
+        )
 
-        if cb_data == 'filtro_voltar':
-            await pagina_callback(update, context)
+        if handler is None:
+            logger.debug('[HCB] Sem handler para %r.', cb_data)
             return
-
-        if not resultados_busca:
-            await query.message.reply_text(
-                'ℹ️ Filtragem indisponível (sem resultados na busca atual).'
-            )
-            return
-
-        # Lógica de filtro refatorada
-        filter_actions = {
-            'filtro_cidade': lambda: (
-                query.message.reply_text('Digite a cidade para filtrar:'),
-                context.user_data.update({'aguardando_input': 'cidade'})
-            ),
-            'filtro_cep': lambda: (
-                query.message.reply_text('Digite o CEP para filtrar:'),
-                context.user_data.update({'aguardando_input': 'cep'})
-            ),
-            'filtro_uf': lambda: query.message.reply_text(
-                'Selecione uma UF:', reply_markup=criar_teclado_ufs_comuns()
-            ),
-            'filtro_operadora': lambda: query.message.reply_text(
-                'Selecione uma operadora:',
-                reply_markup=criar_teclado_operadoras_comuns(),
-            ),
-            'filtro_uf_custom': lambda: (
-                query.message.reply_text(
-                    'Digite a UF para filtrar (ex: SP, RJ):'
-                ),
-                context.user_data.update({'aguardando_input': 'uf'})
-            ),
-            'filtro_operadora_custom': lambda: (
-                query.message.reply_text(
-                    'Digite a operadora para filtrar:'
-                ),
-                context.user_data.update({'aguardando_input': 'operadora'})
-            ),
-            'filtro_tipo': lambda: query.message.reply_text(
-                'Selecione o tipo de endereço:',
-                reply_markup=criar_teclado_tipos_endereco(),
-            ),
-        }
-
-        action = filter_actions.get(cb_data)
-        if action:
-            await action()  # Executa a ação do dicionário
-        elif cb_data.startswith('filtro_uf_'):
-            uf = cb_data.replace('filtro_uf_', '')
-            await _processar_busca(update, context, params_busca={'uf': uf})
-        elif cb_data.startswith('filtro_op_'):
-            operadora = cb_data.replace('filtro_op_', '')
-            await _processar_busca(
-                update, context, params_busca={'operadora': operadora}
-            )
+        await handler(update, context)
 
     except Exception as e:
-        logger.error(f"[HCB] Erro cb {cb_data}: {e}", exc_info=True)
+        logger.error('[HCB] Erro cb %s: %s', cb_data, e, exc_info=True)
         try:
             await query.message.reply_text(
-                "😕 Erro ao processar. Tente novamente."
+                _MSG_ERRO_GENERICO, parse_mode=ParseMode.MARKDOWN_V2
             )
         except Exception as inner_e:
             logger.error(
-                f"[HCB] Erro ao enviar msg erro: {inner_e}", exc_info=True
+                '[HCB] Erro ao enviar msg erro: %s', inner_e, exc_info=True
             )
 
 
+async def _buscar_com_filtro(
+    update: Update,
+    context: ContextTypes.DEFAULT_TYPE,
+    chave: str,
+    valor: str,
+) -> None:
+    """
+    Refaz a busca atual na API com um filtro adicional.
+
+    O filtro é somado aos critérios da busca que gerou os resultados,
+    para que a API restrinja a consulta em vez de trazer tudo de novo.
+    """
+    criterios = context.user_data.get('busca_criterios')
+    # Coordenadas, ID e códigos não passam pela listagem da API, que é
+    # quem aplica os filtros; somá-los a esses critérios seria ignorado
+    if not criterios or not _CRITERIOS_FILTRAVEIS.issuperset(criterios):
+        await update.callback_query.message.reply_text(
+            _MSG_FILTRO_INDISPONIVEL, parse_mode=ParseMode.MARKDOWN_V2
+        )
+        return
+    await _processar_busca(
+        update, context, params_busca={**criterios, chave: valor}
+    )
+
+
+async def _mostrar_filtros(
+    update: Update, context: ContextTypes.DEFAULT_TYPE
+) -> None:
+    """Exibe o teclado de filtros no lugar da página de resultados."""
+    await _substituir_por_teclado(
+        update.callback_query,
+        context,
+        'Selecione um filtro:',
+        criar_teclado_filtros(),
+    )
+
+
+async def _substituir_por_teclado(
+    query: CallbackQuery,
+    context: ContextTypes.DEFAULT_TYPE,
+    texto: str,
+    teclado: InlineKeyboardMarkup,
+) -> None:
+    """
+    Edita a própria mensagem do botão em vez de enviar uma nova.
+
+    A assinatura da última página exibida é descartada, pois a mensagem
+    deixa de mostrar resultados e 'filtrar_voltar' precisa redesenhá-la.
+    """
+    obter_caches(context.user_data).pop('_ultima_pagina_exibida', None)
+    await query.edit_message_text(texto, reply_markup=teclado)
+
+
+async def _aguardar_input(
+    query: CallbackQuery,
+    context: ContextTypes.DEFAULT_TYPE,
+    campo: str,
+    pergunta: str,
+) -> None:
+    """Marca o campo aguardado do usuário e envia a pergunta."""
+    context.user_data['aguardando_input'] = campo
+    await query.message.reply_text(pergunta)
+
+
+async def _mostrar_teclado_filtro(
+    query: CallbackQuery,
+    context: ContextTypes.DEFAULT_TYPE,
+    pergunta: str,
+    criar_teclado: Callable[[], InlineKeyboardMarkup],
+) -> None:
+    """Troca o menu de filtros pela pergunta com o teclado de opções."""
+    await _substituir_por_teclado(query, context, pergunta, criar_teclado())
+
+
+# Ações dos botões de filtro, montadas uma única vez: cada uma recebe
+# (query, context). Os botões dos resultados usam 'filtrar_' porque
+# 'filtro_*' pertence à exploração, cujo handler é registrado antes
+_ACOES_FILTRO = {
+    'filtrar_cidade': partial(
+        _aguardar_input,
+        campo='cidade',
+        pergunta='Digite a cidade para filtrar:',
+    ),
+    'filtrar_cep': partial(
+        _aguardar_input, campo='cep', pergunta='Digite o CEP para filtrar:'
+    ),
+    'filtrar_uf': partial(
+        _mostrar_teclado_filtro,
+        pergunta='Selecione uma UF:',
+        criar_teclado=criar_teclado_ufs_comuns,
+    ),
+    'filtrar_operadora': partial(
+        _mostrar_teclado_filtro,
+        pergunta='Selecione uma operadora:',
+        criar_teclado=criar_teclado_operadoras_comuns,
+    ),
+    'filtrar_uf_custom': partial(
+        _aguardar_input,
+        campo='uf',
+        pergunta='Digite a UF para filtrar (ex: SP, RJ):',
+    ),
+    'filtrar_operadora_custom': partial(
+        _aguardar_input,
+        campo='operadora',
+        pergunta='Digite a operadora para filtrar:',
+    ),
+    'filtrar_tipo': partial(
+        _mostrar_teclado_filtro,
+        pergunta='Selecione o tipo de endereço:',
+        criar_teclado=criar_teclado_tipos_endereco,
+    ),
+}
+
+# Campo do callback filtrar_<campo>_<valor> -> critério da busca na API
+_FILTROS_COM_VALOR = {'uf': 'uf', 'op': 'operadora'}
+
+
+async def filtro_callback(
+    update: Update, context: ContextTypes.DEFAULT_TYPE
+) -> None:
+    """
+    Handler para callbacks de filtro dos resultados da busca atual.
+
+    Só é chamado com resultados na busca: handle_callback avisa antes.
+    """
+    query = update.callback_query
+    cb_data = query.data
+
+    acao = _ACOES_FILTRO.get(cb_data)
+    if acao:
+        await acao(query, context)
+        return
+
+    # filtrar_<campo>_<valor>, ex.: filtrar_uf_SP, filtrar_op_VIVO
+    campo, _, valor = cb_data.removeprefix('filtrar_').partition('_')
+    chave = _FILTROS_COM_VALOR.get(campo)
+    if chave and valor:
+        await _buscar_com_filtro(update, context, chave, valor)
+
+
+def _contar_paginas(total_resultados: int) -> int:
+    """Número de páginas necessárias para exibir total_resultados."""
+    paginas_cheias, resto = divmod(total_resultados, ITENS_POR_PAGINA)
+    return paginas_cheias + (1 if resto else 0)
+
+
 def _preparar_mensagem_pagina(
-    resultados: list, pagina: int, total_resultados: int
+    resultados: list, pagina: int, total_resultados: int, total_paginas: int
 ) -> tuple[str, int, int]:
     """
     Prepara a mensagem e os dados de paginação para exibição.
     Retorna a mensagem formatada, o início e o fim dos itens da página.
     """
-    total_paginas = (
-        total_resultados + ITENS_POR_PAGINA - 1
-    ) // ITENS_POR_PAGINA
     inicio = pagina * ITENS_POR_PAGINA
-    fim = min(inicio + ITENS_POR_PAGINA, total_resultados)
-    logger.info(
-        f'_preparar_mensagem_pagina: Calculado: total_resultados={
-            total_resultados
-        }, '
-        f'total_paginas={total_paginas}, inicio={inicio}, fim={fim}'
+    # Só a última página pode ficar incompleta
+    if pagina < total_paginas - 1:
+        fim = inicio + ITENS_POR_PAGINA
+    else:
+        fim = total_resultados
+    logger.debug(
+        '_preparar_mensagem_pagina: Calculado: total_resultados=%s, '
+        'total_paginas=%s, inicio=%s, fim=%s',
+        total_resultados,
+        total_paginas,
+        inicio,
+        fim,
     )
 
-    itens_pagina = resultados[inicio:fim]
-    log_itens_pagina = f'_preparar_mensagem_pagina: {
-        len(itens_pagina)
-    } itens para a página atual.'
-    logger.info(log_itens_pagina)
+    # Página única (inclusive o caso de um só resultado): a lista inteira
+    # já é a página, sem precisar copiar um slice
+    if inicio == 0 and fim == total_resultados:
+        itens_pagina = resultados
+    else:
+        itens_pagina = resultados[inicio:fim]
+    logger.debug(
+        '_preparar_mensagem_pagina: %s itens para a página atual.',
+        len(itens_pagina),
+    )
 
     if total_resultados == 1:
         mensagem_cabecalho = ''  # Sem cabeçalho para um único resultado
     else:
-        msg_ini = inicio + 1
-        msg_fim = fim
-        msg_total = total_resultados
         mensagem_cabecalho = (
-            f'🏢 *Exibindo resultados {msg_ini}-{msg_fim} de {msg_total}*\n\n'
+            f'🏢 *Exibindo resultados {inicio + 1}\\-{fim} de '
+            f'{total_resultados}*\n\n'
         )
 
-    mensagem_lista = formatar_lista_resultados(
-        itens_pagina,
-        pagina + 1,  # pagina + 1 para exibição 1-based
-        total_paginas,
-        formatador=formatar_endereco,  # Adiciona o formatador aqui
+    # Cabeçalho e itens juntados de uma vez, sem strings intermediárias
+    mensagem = ''.join(
+        chain(
+            (mensagem_cabecalho,),
+            iterar_lista_resultados(
+                itens_pagina,
+                pagina + 1,  # pagina + 1 para exibição 1-based
+                total_paginas,
+                formatador=formatar_endereco,
+            ),
+        )
     )
-    mensagem = mensagem_cabecalho + mensagem_lista
-    # Log truncado para evitar mensagens de log excessivamente longas
-    log_msg_formatada = (
-        f'_preparar_mensagem_pagina: Mensagem formatada: {mensagem[:200]}...'
+    logger.debug(
+        '_preparar_mensagem_pagina: Mensagem formatada com %d caracteres.',
+        len(mensagem),
     )
-    logger.debug(log_msg_formatada)
     return mensagem, inicio, fim
 
 
+def _obter_mensagem_pagina(
+    context: ContextTypes.DEFAULT_TYPE,
+    resultados: list,
+    pagina: int,
+    total_resultados: int,
+) -> tuple[str, int, int]:
+    """
+    Retorna a página formatada, reaproveitando o cache da sessão.
+
+    O cache guarda uma referência à lista de resultados de origem e é
+    descartado assim que uma nova busca substitui resultados_busca.
+    Mantém só as _MAX_PAGINAS_EM_CACHE páginas usadas mais recentemente.
+    """
+    caches = obter_caches(context.user_data)
+    cache = caches.get('_pagina_cache')
+    if cache is None or cache['fonte'] is not resultados:
+        # O total de páginas só muda com uma nova busca: calcula uma vez
+        cache = {
+            'fonte': resultados,
+            'total_paginas': _contar_paginas(total_resultados),
+            'paginas': {},
+        }
+        caches['_pagina_cache'] = cache
+
+    pagina_formatada = cache['paginas'].get(pagina)
+    if pagina_formatada is None:
+        pagina_formatada = _preparar_mensagem_pagina(
+            resultados, pagina, total_resultados, cache['total_paginas']
+        )
+    _guardar_pagina(cache['paginas'], pagina, pagina_formatada)
+    return pagina_formatada
+
+
+def _guardar_pagina(
+    paginas: dict, pagina: int, pagina_formatada: tuple[str, int, int]
+) -> None:
+    """Guarda a página como a mais recente, descartando a mais antiga."""
+    if paginas.pop(pagina, None) is None and (
+        len(paginas) >= _MAX_PAGINAS_EM_CACHE
+    ):
+        # dict preserva a ordem de inserção: o primeiro é o mais antigo
+        del paginas[next(iter(paginas))]
+    paginas[pagina] = pagina_formatada
+
+
+# Páginas sendo pré-carregadas, para não duplicar o trabalho
+_prefetch_em_andamento: set[tuple[int, int]] = set()
+
+
+async def _prefetch_pagina(
+    context: ContextTypes.DEFAULT_TYPE,
+    resultados: list,
+    pagina: int,
+    total_resultados: int,
+    total_paginas: int,
+) -> None:
+    """
+    Formata uma página no cache enquanto o usuário lê a atual.
+
+    A formatação roda numa thread para não ocupar o event loop; o cache
+    só é alterado de volta no loop, se a busca ainda for a mesma.
+    """
+    chave = (id(resultados), pagina)
+    try:
+        pagina_formatada = await asyncio.to_thread(
+            _preparar_mensagem_pagina,
+            resultados,
+            pagina,
+            total_resultados,
+            total_paginas,
+        )
+        # Uma nova busca pode ter substituído os resultados nesse meio tempo
+        cache = obter_caches(context.user_data).get('_pagina_cache')
+        if cache is not None and cache['fonte'] is resultados:
+            _guardar_pagina(cache['paginas'], pagina, pagina_formatada)
+    finally:
+        _prefetch_em_andamento.discard(chave)
+
+
+def _agendar_prefetch_vizinhas(
+    update: Update,
+    context: ContextTypes.DEFAULT_TYPE,
+    resultados: list,
+    pagina: int,
+    total_resultados: int,
+) -> None:
+    """
+    Agenda o pré-carregamento das páginas anterior e seguinte.
+
+    As tasks ficam com a Application, que as mantém vivas e registra
+    eventuais erros no error handler.
+    """
+    cache = obter_caches(context.user_data)['_pagina_cache']
+    total_paginas = cache['total_paginas']
+    paginas_em_cache = cache['paginas']
+    for vizinha in (pagina + 1, pagina - 1):
+        chave = (id(resultados), vizinha)
+        if (
+            not 0 <= vizinha < total_paginas
+            or vizinha in paginas_em_cache
+            or chave in _prefetch_em_andamento
+        ):
+            continue
+        _prefetch_em_andamento.add(chave)
+        context.application.create_task(
+            _prefetch_pagina(
+                context, resultados, vizinha, total_resultados, total_paginas
+            ),
+            update=update,
+        )
+
+
 async def pagina_callback(
     update: Update, context: ContextTypes.DEFAULT_TYPE
 ) -> None:
@@ -227,70 +526,129 @@ async def pagina_callback(
     Handler para callbacks de paginação.
     """
     query = update.callback_query
-    await query.answer()
 
     callback_data = query.data
-    logger.info(f'pagina_callback: Recebido callback_data: {callback_data}')
+    logger.debug('pagina_callback: Recebido callback_data: %s', callback_data)
 
     if callback_data == 'pagina_info':
-        logger.info(
+        logger.debug(
             "pagina_callback: callback_data é 'pagina_info', retornando."
         )
         return
 
-    resultados = context.user_data.get('resultados_busca', [])
-    log_resultados = (
-        f'pagina_callback: {len(resultados)} resultados encontrados no '
-        f'context.user_data.'  # Quebra de linha para respeitar o limite
+    resultados = context.user_data.get('resultados_busca') or _VAZIO
+    total_resultados = len(resultados)
+    logger.debug(
+        'pagina_callback: %s resultados encontrados no context.user_data.',
+        total_resultados,
     )
-    logger.info(log_resultados)
 
-    if not resultados:
+    if not total_resultados:
         logger.warning(
             'pagina_callback: Nenhum resultado encontrado para paginação.'
         )
-        # Corrigindo escape para MarkdownV2
-        await query.message.reply_text('😕 Não há resultados para mostrar.')
+        await query.message.reply_text(
+            _MSG_SEM_RESULTADOS, parse_mode=ParseMode.MARKDOWN_V2
+        )
         return
 
-    match = re.match(r'pagina_(\d+)', callback_data)
-    pagina = int(match.group(1)) if match else 0
-    logger.info(f'pagina_callback: Página solicitada: {pagina}')
+    # 'filtrar_voltar' e 'sugestao_voltar' também chegam aqui: página 0
+    sufixo = callback_data.removeprefix(_PREFIXO_PAGINA)
+    pagina = int(sufixo) if sufixo.isdecimal() else 0
+    logger.debug('pagina_callback: Página solicitada: %s', pagina)
 
     context.user_data['pagina_atual'] = pagina
-    total_resultados = len(resultados)
 
     # Chama a função auxiliar para preparar a mensagem
-    mensagem, inicio_item, fim_item = _preparar_mensagem_pagina(
-        resultados, pagina, total_resultados
+    mensagem, inicio_item, fim_item = _obter_mensagem_pagina(
+        context, resultados, pagina, total_resultados
     )
 
     # Modificado para passar total_resultados para o teclado
     reply_markup = criar_teclado_resultados_combinado(
         pagina_atual=pagina, total_resultados=total_resultados
     )
-    logger.info('pagina_callback: Teclado de resultados criado.')
+    logger.debug('pagina_callback: Teclado de resultados criado.')
+
+    # Mesma página na mesma mensagem: o Telegram recusaria a edição
+    # ("message is not modified"), então nem faz a chamada. Sem registro
+    # da última edição (ex.: após reiniciar), compara com a própria
+    # mensagem; o teclado vem primeiro por ser a comparação mais barata
+    assinatura = (query.message.message_id, hash(mensagem))
+    caches = obter_caches(context.user_data)
+    if caches.get('_ultima_pagina_exibida') == assinatura or (
+        query.message.reply_markup == reply_markup
+        and query.message.text_markdown_v2 == mensagem
+    ):
+        caches['_ultima_pagina_exibida'] = assinatura
+        logger.debug('pagina_callback: Página já exibida, nada a editar.')
+        return
 
     try:
-        logger.info('pagina_callback: Tentando editar mensagem existente.')
+        logger.debug('pagina_callback: Tentando editar mensagem existente.')
         await query.message.edit_text(
             mensagem,
             parse_mode=ParseMode.MARKDOWN_V2,
             reply_markup=reply_markup,
         )
-        logger.info('pagina_callback: Mensagem editada com sucesso.')
-    except Exception as e:
-        logger.error(f'pagina_callback: Erro ao atualizar mensagem: {str(e)}')
-        logger.info(
-            'pagina_callback: Tentando enviar nova mensagem como fallback.'
+        caches['_ultima_pagina_exibida'] = assinatura
+        logger.debug('pagina_callback: Mensagem editada com sucesso.')
+        _agendar_prefetch_vizinhas(
+            update, context, resultados, pagina, total_resultados
         )
-        # Corrigindo escape para MarkdownV2
-        await query.message.reply_text(
+    except BadRequest as e:
+        erro = str(e).lower()
+        if 'not modified' in erro:
+            caches['_ultima_pagina_exibida'] = assinatura
+            logger.debug('pagina_callback: Mensagem já estava atualizada.')
+        elif 'not found' in erro:
+            # A mensagem original sumiu; só então envia uma nova
+            logger.info(
+                'pagina_callback: Mensagem original não encontrada, '
+                'enviando nova mensagem.'
+            )
+            await query.message.reply_text(
+                mensagem,
+                parse_mode=ParseMode.MARKDOWN_V2,
+                reply_markup=reply_markup,
+            )
+        else:
+            logger.error('pagina_callback: Erro ao atualizar mensagem: %s', e)
+    except NetworkError as e:
+        # Inclui TimedOut: tenta editar mais uma vez após uma pausa. A
+        # espera roda numa task à parte; sem concurrent_updates, dormir
+        # aqui seguraria os updates de todos os usuários
+        logger.warning(
+            'pagina_callback: Falha de rede ao editar mensagem (%s), '
+            'tentando novamente.',
+            e,
+        )
+        context.application.create_task(
+            _editar_pagina_novamente(
+                query, context, mensagem, reply_markup, assinatura
+            ),
+            update=update,
+        )
+
+
+async def _editar_pagina_novamente(
+    query: CallbackQuery,
+    context: ContextTypes.DEFAULT_TYPE,
+    mensagem: str,
+    reply_markup: InlineKeyboardMarkup,
+    assinatura: tuple[int, int],
+) -> None:
+    """Repete a edição da página após uma falha de rede."""
+    await asyncio.sleep(_ESPERA_NOVA_TENTATIVA)
+    try:
+        await query.message.edit_text(
             mensagem,
             parse_mode=ParseMode.MARKDOWN_V2,
             reply_markup=reply_markup,
         )
-        logger.info('pagina_callback: Nova mensagem enviada com sucesso.')
+        obter_caches(context.user_data)['_ultima_pagina_exibida'] = assinatura
+    except TelegramError as e:
+        logger.error('pagina_callback: Erro ao atualizar mensagem: %s', e)
 
 
 async def tipo_callback(
@@ -298,27 +656,15 @@ async def tipo_callback(
 ) -> None:
     """
     Handler para callbacks de tipo de endereço.
+
+    Só é chamado com resultados na busca: handle_callback avisa antes.
     """
     query = update.callback_query
-    await query.answer()
-
-    # Adiciona a verificação do número de resultados
-    resultados_busca = context.user_data.get('resultados_busca', [])
-    if not resultados_busca:  # Modificado para verificar se a lista está vazia
-        await query.message.reply_text(
-            (
-                'ℹ️ A filtragem por tipo não está disponível pois não há '
-                'resultados na busca atual\\.'
-            ),
-            parse_mode=ParseMode.MARKDOWN_V2,
-        )
-        return
-
     callback_data = query.data
 
-    match = re.match(r'tipo_(\w+)', callback_data)
-    if match:
-        tipo_param = match.group(1)
+    # O despacho garante o prefixo 'tipo_'; o resto é o tipo
+    tipo_param = callback_data[len(_PREFIXO_TIPO):]
+    if tipo_param:
         # Renomeado para evitar conflito
         # A função _processar_busca espera um dicionário para params_busca
         # e o parâmetro de tipo é 'tipo_logradouro',
@@ -330,9 +676,7 @@ async def tipo_callback(
         # Para este exemplo, vamos assumir que _processar_busca pode lidar
         #  com um param 'tipo'.
         # Se for um tipo específico (ex: tipo_logradouro), ajuste aqui.
-        await _processar_busca(
-            update, context, params_busca={'tipo': tipo_param}
-        )
+        await _buscar_com_filtro(update, context, 'tipo', tipo_param)
 
 
 async def sugestao_callback(
@@ -342,7 +686,6 @@ async def sugestao_callback(
     Handler para callbacks relacionados a sugestões.
     """
     query = update.callback_query
-    await query.answer()
 
     callback_data = query.data
 
@@ -353,30 +696,15 @@ async def sugestao_callback(
         )
 
     elif callback_data.startswith('sugestao_'):
-        tipo = callback_data.replace('sugestao_', '')
+        tipo = callback_data.removeprefix('sugestao_')
 
-        if tipo in {'adicao', 'modificacao', 'remocao'}:  # Usando set
+        acao = _SUGESTAO_ACOES.get(tipo)
+        if acao is not None:
+            pergunta, aguardando = acao
             context.user_data['tipo_sugestao'] = tipo
-            # ... (restante da lógica de sugestao)
-            if tipo == 'adicao':
-                # Quebrando linha longa
-                msg_adicao = (
-                    'Por favor, descreva o endereço que deseja adicionar, '
-                    'incluindo logradouro, número, bairro, cidade, UF e CEP:'
-                )
-                await query.message.reply_text(msg_adicao)
-            elif tipo == 'modificacao':
-                await query.message.reply_text(
-                    'Por favor, informe o ID do endereço que deseja modificar:'
-                )
-                context.user_data['aguardando_input'] = (
-                    'id_endereco_modificacao'
-                )
-            elif tipo == 'remocao':
-                await query.message.reply_text(
-                    'Por favor, informe o ID do endereço que deseja remover:'
-                )
-                context.user_data['aguardando_input'] = 'id_endereco_remocao'
+            await query.message.reply_text(pergunta)
+            if aguardando:
+                context.user_data['aguardando_input'] = aguardando
 
         elif tipo == 'voltar':
             await pagina_callback(update, context)
@@ -389,18 +717,18 @@ async def confirma_callback(
     Handler para callbacks de confirmação.
     """
     query = update.callback_query
-    await query.answer()
 
     callback_data = query.data
 
     if callback_data.endswith('_sim'):
-        prefixo = callback_data.replace('_sim', '')
+        prefixo = callback_data.removesuffix('_sim')
 
         if prefixo == 'confirma_sugestao':
-            tipo_sugestao = context.user_data.get('tipo_sugestao')
-            detalhe = context.user_data.get('detalhe_sugestao')
-            id_endereco = context.user_data.get('id_endereco_sugestao')
-            usuario_id = context.user_data.get('usuario_id')
+            dados_usuario = context.user_data
+            tipo_sugestao = dados_usuario.get('tipo_sugestao')
+            detalhe = dados_usuario.get('detalhe_sugestao')
+            id_endereco = dados_usuario.get('id_endereco_sugestao')
+            usuario_id = dados_usuario.get('usuario_id')
 
             # Corrigido: 'e' para 'and' e quebra de linha
             if tipo_sugestao and detalhe and usuario_id:
@@ -411,35 +739,29 @@ async def confirma_callback(
                         detalhe=detalhe,
                         id_endereco=id_endereco,
                     )
-                    msg_sucesso_p1 = '✅ Sugestão enviada com sucesso\\! '
-                    msg_sucesso_p2 = f'ID: {resultado.get("id")}\n'
-                    msg_sucesso_p3 = (
-                        'Nossa equipe irá analisar e responder em breve\\.'
-                    )
                     await query.message.reply_text(
-                        msg_sucesso_p1 + msg_sucesso_p2 + msg_sucesso_p3,
+                        _MSG_SUGESTAO_ENVIADA.format(
+                            id=escape_markdown(str(resultado.get('id')))
+                        ),
                         parse_mode=ParseMode.MARKDOWN_V2,
                     )
 
-                    context.user_data.pop('tipo_sugestao', None)
-                    context.user_data.pop('detalhe_sugestao', None)
-                    context.user_data.pop('id_endereco_sugestao', None)
+                    for chave in _CHAVES_SUGESTAO:
+                        dados_usuario.pop(chave, None)
                 except Exception as e:
-                    logger.error(f'Erro ao criar sugestão: {str(e)}')
-                    err_msg_sugestao = (
-                        '😞 Ocorreu um erro ao enviar sua sugestão\\. '
-                        'Por favor, tente novamente mais tarde\\.'
+                    logger.error('Erro ao criar sugestão: %s', e)
+                    await query.message.reply_text(
+                        _MSG_ERRO_SUGESTAO, parse_mode=ParseMode.MARKDOWN_V2
                     )
-                    await query.message.reply_text(err_msg_sugestao)
             else:
-                warn_msg_sugestao = (
-                    '❌ Dados incompletos para enviar a sugestão\\. '
-                    'Por favor, tente novamente\\.'
+                await query.message.reply_text(
+                    _MSG_SUGESTAO_INCOMPLETA, parse_mode=ParseMode.MARKDOWN_V2
                 )
-                await query.message.reply_text(warn_msg_sugestao)
 
     elif callback_data.endswith('_nao'):
-        await query.message.reply_text('❌ Operação cancelada\\\\.')
+        await query.message.reply_text(
+            _MSG_OPERACAO_CANCELADA, parse_mode=ParseMode.MARKDOWN_V2
+        )
 
 
 # Transiciona para o estado de receber o texto da anotação
@@ -452,66 +774,58 @@ async def ler_anotacoes_callback(
     Busca e exibe as anotações de um endereço específico.
     """
     query = update.callback_query
-    await query.answer()
     callback_data = query.data
-    logger.info(f'ler_anotacoes_callback: {callback_data}')
+    logger.debug('ler_anotacoes_callback: %s', callback_data)
 
-    match = re.match(r'ler_anotacoes_(\d+)', callback_data)
-    # Corrigido: Removido \\ extra
-    if not match:
+    # O despacho só garante o token 'ler'; confere o prefixo completo
+    sufixo = callback_data.removeprefix(_PREFIXO_LER_ANOTACOES)
+    if sufixo == callback_data or not sufixo.isdecimal():
         logger.warning(
-            f'Callback de ler anotações mal formatado: {callback_data}'
+            'Callback de ler anotações mal formatado: %s', callback_data
         )
-        # Corrigido: Adicionado escape para o ponto final.
         await query.message.reply_text(
-            'Erro ao processar o ID do endereço para ler anotações\\\\.'
+            _MSG_ERRO_ID_ANOTACOES, parse_mode=ParseMode.MARKDOWN_V2
         )
         return
 
-    id_endereco = int(match.group(1))
+    id_endereco = int(sufixo)
     user_id = update.effective_user.id
 
-    # Corrigido: Adicionado escape para os pontos da reticência.
-    await query.message.reply_text(
-        f'Buscando anotações para o endereço ID {id_endereco}\\.\\.\\.',
-        parse_mode=ParseMode.MARKDOWN_V2,
-    )
-
     try:
+        # O aviso de busca vai como toast na resposta do callback
+        # (_AVISOS_AO_RESPONDER); só o resultado é enviado ao chat
         anotacoes_data = await listar_anotacoes(
             id_endereco=id_endereco, user_id=user_id
         )
 
-        # Usar o sistema consolidado do formatters.py
-        if isinstance(anotacoes_data, list) and anotacoes_data:
+        # Caso mais comum primeiro: nada a exibir. Lista vazia é resposta
+        # válida; None ou dict vazio indicam que algo falhou na consulta
+        if not anotacoes_data:
+            if isinstance(anotacoes_data, list):
+                modelo = _MSG_SEM_ANOTACOES
+            else:
+                modelo = _MSG_SEM_ANOTACOES_OU_ERRO
+            mensagem = modelo.format(id=id_endereco)
+        elif isinstance(anotacoes_data, dict):
+            aviso_api = anotacoes_data.get('detail') or anotacoes_data.get(
+                'message'
+            )
+            if aviso_api:
+                mensagem = f'ℹ️ {_escapar_aviso_api(str(aviso_api))}'
+            else:
+                mensagem = _MSG_ANOTACOES_RESPOSTA_INESPERADA.format(
+                    id=id_endereco
+                )
+        elif isinstance(anotacoes_data, list):
+            # Usar o sistema consolidado do formatters.py
             anotacoes_proprias, anotacoes_outras = (
                 filtrar_anotacoes_por_privilegio(anotacoes_data, user_id)
             )
             mensagem = formatar_anotacoes_para_exibicao(
                 anotacoes_proprias, anotacoes_outras
             )
-        elif isinstance(anotacoes_data, list) and not anotacoes_data:
-            mensagem = (
-                f'ℹ️ Nenhuma anotação encontrada para o endereço ID '
-                f'{id_endereco}\\.'
-            )
-        elif isinstance(anotacoes_data, dict):
-            detail_message = anotacoes_data.get('detail')
-            specific_message = anotacoes_data.get('message')
-            if detail_message:
-                mensagem = f'ℹ️ {escape_markdown(str(detail_message))}'
-            elif specific_message:
-                mensagem = f'ℹ️ {escape_markdown(str(specific_message))}'
-            else:
-                mensagem = (
-                    f'ℹ️ Resposta inesperada ao buscar anotações para o '
-                    f'endereço ID {id_endereco}\\.'
-                )
         else:
-            mensagem = (
-                f'ℹ️ Nenhuma anotação encontrada para o endereço ID '
-                f'{id_endereco} ou ocorreu um erro ao buscar\\.'
-            )
+            mensagem = _MSG_SEM_ANOTACOES_OU_ERRO.format(id=id_endereco)
 
         await query.message.reply_text(
             mensagem, parse_mode=ParseMode.MARKDOWN_V2
@@ -519,13 +833,78 @@ async def ler_anotacoes_callback(
 
     except Exception as e:
         logger.error(
-            f'Erro ao listar anotações para o endereço ID {id_endereco}: {e}'
-        )
-        # Corrigido: f-string de múltiplas linhas e escape de pontos finais.
-        mensagem_erro = (
-            f'😞 Ocorreu um erro ao buscar as anotações para o endereço ID '
-            f'{id_endereco}\\. Por favor, tente novamente mais tarde\\.'
+            'Erro ao listar anotações para o endereço ID %s: %s',
+            id_endereco,
+            e,
         )
         await query.message.reply_text(
-            mensagem_erro, parse_mode=ParseMode.MARKDOWN_V2
+            _MSG_ERRO_ANOTACOES.format(id=id_endereco),
+            parse_mode=ParseMode.MARKDOWN_V2,
         )
+
+
+async def _ignorar_callback(
+    update: Update, context: ContextTypes.DEFAULT_TYPE
+) -> None:
+    """Callbacks de conversa/menu: tratados por outros handlers."""
+    logger.debug(
+        '[HCB] Cb %r (conv/menu), skip generic.', update.callback_query.data
+    )
+
+
+# Tabelas de despacho do handle_callback, montadas uma única vez.
+# Callbacks exatos têm prioridade sobre o despacho pelo primeiro token
+# do callback_data (o trecho antes do primeiro '_'); os de conversa e de
+# menu caem num no-op na mesma consulta.
+_CALLBACKS_EXATOS = {
+    **dict.fromkeys(_CALLBACKS_CONVERSA | _CALLBACKS_MENU, _ignorar_callback),
+    'mostrar_filtros': _mostrar_filtros,
+    'filtrar_voltar': pagina_callback,
+    'pagina_info': pagina_callback,
+    'mostrar_sugestoes': sugestao_callback,
+}
+_CALLBACK_DISPATCH = {
+    'filtrar': filtro_callback,
+    'pagina': pagina_callback,
+    'tipo': tipo_callback,
+    'sugestao': sugestao_callback,
+    'confirma': confirma_callback,
+    'ler': ler_anotacoes_callback,
+}
+
+
+def _resolver_handler(cb_data: str) -> Callable | None:
+    """
+    Uma consulta exata e, se falhar, uma pelo primeiro token.
+
+    Da paginação, só 'pagina_<n>' e 'pagina_info' são dos resultados:
+    'pagina_proxima' e 'pagina_anterior' pertencem ao teclado da
+    exploração e não podem redesenhar a mensagem como página 0.
+    """
+    handler = _CALLBACKS_EXATOS.get(cb_data)
+    if handler is not None:
+        return handler
+    prefixo, _, sufixo = cb_data.partition('_')
+    if prefixo == 'pagina' and not sufixo.isdecimal():
+        return None
+    return _CALLBACK_DISPATCH.get(prefixo)
+
+
+# Avisos curtos (texto puro, até 200 caracteres) respondidos como toast
+# quando o handler precisa de resultados e a busca atual está vazia
+_AVISOS_SEM_RESULTADOS = {
+    filtro_callback: (
+        'ℹ️ A filtragem só está disponível quando há resultados na busca '
+        'atual.'
+    ),
+    tipo_callback: (
+        'ℹ️ A filtragem por tipo não está disponível pois não há '
+        'resultados na busca atual.'
+    ),
+    pagina_callback: '😕 Não há resultados para mostrar.',
+}
+# Toast exibido ao responder o callback, no lugar de uma mensagem de
+# progresso enviada ao chat
+_AVISOS_AO_RESPONDER = {
+    ler_anotacoes_callback: 'Buscando anotações...',
+}
@@ -30,6 +30,7 @@ from ..services.anotacao import listar_anotacoes_por_endereco
 from ..services.auth import obter_nivel_acesso_usuario
 from ..services.endereco import buscar_endereco_por_codigo
 from ..services.resultado_paginacao import ResultadoPaginador
+from ..shared.sessao import substituir_resultados
 from ..shared.types import SELECIONANDO_TIPO_CODIGO
 
 logger = logging.getLogger(__name__)
@@ -172,7 +173,7 @@ async def exibir_multiplos_resultados(
     """
     try:
         # Armazena os dados necessários no contexto
-        context.user_data['resultados_busca'] = resultados
+        substituir_resultados(context.user_data, resultados)
         context.user_data['codigo_busca'] = codigo
         context.user_data['nome_tipo_busca'] = nome_tipo
 
@@ -259,7 +260,7 @@ async def show_endereco_callback(
 
     # Extrai o id_sistema do callback
     try:
-        id_sistema = int(query.data.replace('show_endereco_', ''))
+        id_sistema = int(query.data.removeprefix('show_endereco_'))
     except Exception:
         await query.edit_message_text('ID do endereço inválido.')
         return
@@ -332,7 +333,7 @@ async def ver_todas_anotacoes_callback(
 
     # Extrai o id_sistema do callback
     try:
-        id_sistema = int(query.data.replace('ver_anotacoes_endereco_id_', ''))
+        id_sistema = int(query.data.removeprefix('ver_anotacoes_endereco_id_'))
     except Exception:
         await query.edit_message_text('ID do endereço inválido.')
         return
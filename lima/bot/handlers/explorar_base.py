@@ -25,6 +25,7 @@ from ..formatters.endereco import (
 )
 from ..services.anotacao import listar_anotacoes_por_endereco
 from ..services.endereco import FiltrosEndereco, buscar_endereco
+from ..shared.sessao import limpar_resultados, substituir_resultados
 
 # Import para integração com sistema de anotação
 try:
@@ -213,8 +214,7 @@ async def iniciar_exploracao(
 
     # Inicializar filtros vazios
     context.user_data['filtros_ativos'] = {}
-    context.user_data['pagina_atual'] = 0
-    context.user_data['resultados_busca'] = []
+    substituir_resultados(context.user_data, [])
 
     await exibir_tela_filtros(update, context)
     return ConversationHandler.END
@@ -388,8 +388,7 @@ async def executar_busca_filtrada(
             return
 
         # Salvar resultados no contexto
-        context.user_data['resultados_busca'] = resultados
-        context.user_data['pagina_atual'] = 0
+        substituir_resultados(context.user_data, resultados)
 
         await exibir_resultados_busca(update, context)
 
@@ -613,10 +612,10 @@ async def handle_action_callbacks(
     elif data == 'refazer_busca':
         await executar_busca_filtrada(update, context)
     elif data.startswith('ver_endereco_'):
-        endereco_id = data.replace('ver_endereco_', '')
+        endereco_id = data.removeprefix('ver_endereco_')
         await exibir_endereco_detalhado(update, context, endereco_id)
     elif data.startswith('anotar_'):
-        endereco_id = data.replace('anotar_', '')
+        endereco_id = data.removeprefix('anotar_')
         # Chamar diretamente a função de anotação sem modificar query.data
         if iniciar_anotacao_por_callback:
             # Passamos o endereco_id diretamente para o contexto do usuário
@@ -736,8 +735,7 @@ async def cancelar_exploracao(
     """
     # Limpar dados da exploração
     context.user_data.pop('filtros_ativos', None)
-    context.user_data.pop('resultados_busca', None)
-    context.user_data.pop('pagina_atual', None)
+    limpar_resultados(context.user_data)
     context.user_data.pop('endereco_atual', None)
 
     await update.effective_message.reply_text(
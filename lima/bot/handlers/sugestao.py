@@ -4,7 +4,6 @@
 """Handlers para comandos de sugestão."""
 
 import logging
-import re
 
 from telegram import (
     CallbackQuery,
@@ -178,8 +177,8 @@ async def sugerir_callback_conversation(
     callback_data = query.data
     logger.info('sugerir_callback_conversation: %s', callback_data)
 
-    match = re.match(r'sugerir_(\d+)', callback_data)
-    if not match:
+    sufixo = callback_data.removeprefix('sugerir_')
+    if sufixo == callback_data or not sufixo.isdecimal():
         logger.warning('Callback de sugestão mal formatado: %s', callback_data)
         await query.edit_message_text(
             'Erro ao processar o ID do endereço para sugestão\\.',
@@ -187,7 +186,7 @@ async def sugerir_callback_conversation(
         )
         return ConversationHandler.END
 
-    id_endereco = int(match.group(1))
+    id_endereco = int(sufixo)
     context.user_data['id_endereco_sugestao'] = id_endereco
     id_endereco_escaped = escape_markdown(str(id_endereco))
 
@@ -248,8 +247,8 @@ async def sugestao_endereco_callback_conversation(
     callback_data = query.data
     logger.info('sugestao_endereco_callback_conversation: %s', callback_data)
 
-    match = re.match(r'sugestao_endereco_id_(\d+)', callback_data)
-    if not match:
+    sufixo = callback_data.removeprefix('sugestao_endereco_id_')
+    if sufixo == callback_data or not sufixo.isdecimal():
         logger.warning(
             'Callback de sugestão de endereço mal formatado: %s', callback_data
         )
@@ -259,7 +258,7 @@ async def sugestao_endereco_callback_conversation(
         )
         return ConversationHandler.END
 
-    id_endereco = int(match.group(1))
+    id_endereco = int(sufixo)
     context.user_data['id_endereco_sugestao'] = id_endereco
     id_endereco_escaped = escape_markdown(str(id_endereco))
 
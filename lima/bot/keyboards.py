@@ -3,6 +3,7 @@ Teclados interativos para o Telegram.
 Este módulo contém funções para criar teclados inline e de resposta.
 """
 
+from functools import lru_cache
 from typing import List, Optional
 
 from telegram import (
@@ -24,25 +25,26 @@ def criar_teclado_filtros() -> InlineKeyboardMarkup:
     keyboard = [
         [
             InlineKeyboardButton(
-                '🏙️ Filtrar por Cidade', callback_data='filtro_cidade'
+                '🏙️ Filtrar por Cidade', callback_data='filtrar_cidade'
             ),
             InlineKeyboardButton(
-                '📮 Filtrar por CEP', callback_data='filtro_cep'
+                '📮 Filtrar por CEP', callback_data='filtrar_cep'
             ),
         ],
         [
             InlineKeyboardButton(
-                '🏢 Filtrar por UF', callback_data='filtro_uf'
+                '🏢 Filtrar por UF', callback_data='filtrar_uf'
             ),
             InlineKeyboardButton(
-                '📱 Filtrar por Operadora', callback_data='filtro_operadora'
+                '📱 Filtrar por Operadora', callback_data='filtrar_operadora'
             ),
         ],
         [
             InlineKeyboardButton(
-                '🏗️ Filtrar por Tipo', callback_data='filtro_tipo'
+                '🏗️ Filtrar por Tipo', callback_data='filtrar_tipo'
             ),
         ],
+        [InlineKeyboardButton('🔙 Voltar', callback_data='filtrar_voltar')],
     ]
     return InlineKeyboardMarkup(keyboard)
 
@@ -75,7 +77,7 @@ def criar_teclado_tipos_endereco() -> InlineKeyboardMarkup:
                 'Small Cell', callback_data='tipo_small_cell'
             ),
         ],
-        [InlineKeyboardButton('Voltar', callback_data='filtro_voltar')],
+        [InlineKeyboardButton('Voltar', callback_data='filtrar_voltar')],
     ]
     return InlineKeyboardMarkup(keyboard)
 
@@ -299,6 +301,9 @@ def criar_teclado_selecionar_tipo_sugestao_para_endereco(
     return InlineKeyboardMarkup(keyboard)
 
 
+# O teclado depende só dos argumentos e o InlineKeyboardMarkup é imutável,
+# então a mesma instância pode ser reaproveitada entre páginas e usuários
+@lru_cache(maxsize=256)
 def criar_teclado_resultados_combinado(
     pagina_atual: int,
     total_resultados: int,
@@ -413,25 +418,25 @@ def criar_teclado_ufs_comuns() -> InlineKeyboardMarkup:
     """
     keyboard = [
         [
-            InlineKeyboardButton('SP', callback_data='filtro_uf_SP'),
-            InlineKeyboardButton('RJ', callback_data='filtro_uf_RJ'),
-            InlineKeyboardButton('MG', callback_data='filtro_uf_MG'),
+            InlineKeyboardButton('SP', callback_data='filtrar_uf_SP'),
+            InlineKeyboardButton('RJ', callback_data='filtrar_uf_RJ'),
+            InlineKeyboardButton('MG', callback_data='filtrar_uf_MG'),
         ],
         [
-            InlineKeyboardButton('RS', callback_data='filtro_uf_RS'),
-            InlineKeyboardButton('PR', callback_data='filtro_uf_PR'),
-            InlineKeyboardButton('SC', callback_data='filtro_uf_SC'),
+            InlineKeyboardButton('RS', callback_data='filtrar_uf_RS'),
+            InlineKeyboardButton('PR', callback_data='filtrar_uf_PR'),
+            InlineKeyboardButton('SC', callback_data='filtrar_uf_SC'),
         ],
         [
-            InlineKeyboardButton('BA', callback_data='filtro_uf_BA'),
-            InlineKeyboardButton('GO', callback_data='filtro_uf_GO'),
-            InlineKeyboardButton('DF', callback_data='filtro_uf_DF'),
+            InlineKeyboardButton('BA', callback_data='filtrar_uf_BA'),
+            InlineKeyboardButton('GO', callback_data='filtrar_uf_GO'),
+            InlineKeyboardButton('DF', callback_data='filtrar_uf_DF'),
         ],
         [
             InlineKeyboardButton(
-                '✏️ Digitar outra UF', callback_data='filtro_uf_custom'
+                '✏️ Digitar outra UF', callback_data='filtrar_uf_custom'
             ),
-            InlineKeyboardButton('🔙 Voltar', callback_data='filtro_voltar'),
+            InlineKeyboardButton('🔙 Voltar', callback_data='filtrar_voltar'),
         ],
     ]
     return InlineKeyboardMarkup(keyboard)
@@ -446,23 +451,23 @@ def criar_teclado_operadoras_comuns() -> InlineKeyboardMarkup:
     """
     keyboard = [
         [
-            InlineKeyboardButton('CLARO', callback_data='filtro_op_CLARO'),
-            InlineKeyboardButton('VIVO', callback_data='filtro_op_VIVO'),
+            InlineKeyboardButton('CLARO', callback_data='filtrar_op_CLARO'),
+            InlineKeyboardButton('VIVO', callback_data='filtrar_op_VIVO'),
         ],
         [
-            InlineKeyboardButton('TIM', callback_data='filtro_op_TIM'),
-            InlineKeyboardButton('OI', callback_data='filtro_op_OI'),
+            InlineKeyboardButton('TIM', callback_data='filtrar_op_TIM'),
+            InlineKeyboardButton('OI', callback_data='filtrar_op_OI'),
         ],
         [
-            InlineKeyboardButton('ALGAR', callback_data='filtro_op_ALGAR'),
-            InlineKeyboardButton('NEXTEL', callback_data='filtro_op_NEXTEL'),
+            InlineKeyboardButton('ALGAR', callback_data='filtrar_op_ALGAR'),
+            InlineKeyboardButton('NEXTEL', callback_data='filtrar_op_NEXTEL'),
         ],
         [
             InlineKeyboardButton(
                 '✏️ Digitar outra operadora',
-                callback_data='filtro_operadora_custom',
+                callback_data='filtrar_operadora_custom',
             ),
-            InlineKeyboardButton('🔙 Voltar', callback_data='filtro_voltar'),
+            InlineKeyboardButton('🔙 Voltar', callback_data='filtrar_voltar'),
         ],
     ]
     return InlineKeyboardMarkup(keyboard)
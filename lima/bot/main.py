@@ -16,6 +16,7 @@ from telegram.ext import (
     CommandHandler,
     ContextTypes,
     MessageHandler,
+    PicklePersistence,
     filters,
 )
 
@@ -25,6 +26,7 @@ except ImportError:
     from lima.settings import Settings  # Importação absoluta
 
 from .config import (
+    BOT_PERSISTENCE_FILE,
     LOG_LEVEL,
     SECRET_TOKEN,
     TOKEN_BOT,
@@ -150,13 +152,14 @@ def criar_aplicacao() -> Application:
         )
         sys.exit(1)
 
-    # Cria aplicação sem persistência
+    # Cria aplicação; persistência opcional via BOT_PERSISTENCE_FILE
     try:
-        application = (
-            Application.builder()
-            .token(TOKEN_BOT)
-            .build()
-        )
+        builder = Application.builder().token(TOKEN_BOT)
+        if BOT_PERSISTENCE_FILE:
+            builder = builder.persistence(
+                PicklePersistence(filepath=BOT_PERSISTENCE_FILE)
+            )
+        application = builder.build()
     except Exception as e:
         logger.error(f'Erro ao criar aplicação: {str(e)}')
         sys.exit(1)
@@ -359,7 +362,14 @@ async def iniciar_bot() -> None:
 if __name__ == '__main__':
     import asyncio
 
-    asyncio.run(iniciar_bot())
+    # uvloop é opcional: já vem com o uvicorn[standard] do FastAPI, que o
+    # usa sozinho; aqui só o adotamos quando o bot roda isolado
+    try:
+        from uvloop import new_event_loop as criar_loop
+    except ImportError:
+        criar_loop = None
+
+    asyncio.run(iniciar_bot(), loop_factory=criar_loop)
 
 
 def obter_aplicacao() -> Optional[Application]:
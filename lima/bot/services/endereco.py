@@ -51,7 +51,7 @@ async def buscar_endereco(
     params = {}
 
     if filtros.query:
-        params['q'] = filtros.query
+        params['query'] = filtros.query
     if filtros.municipio:
         params['municipio'] = filtros.municipio
     if filtros.uf:
@@ -65,7 +65,7 @@ async def buscar_endereco(
     if filtros.operadora_id:
         params['operadora_id'] = filtros.operadora_id
     # limite é int, sempre terá valor (padrão 10), não precisa de if None
-    params['limite'] = filtros.limite
+    params['limit'] = filtros.limite
 
     if id_endereco:
         # Se busca por ID, usa endpoint específico
@@ -76,9 +76,9 @@ async def buscar_endereco(
         )
         return [endereco] if endereco else []
     else:
-        # Busca geral com filtros
+        # Busca geral com filtros, aplicados pela listagem na consulta
         return await fazer_requisicao_get(
-            'enderecos/', params, user_id=user_id
+            'enderecos/busca/', params, user_id=user_id
         )
 
 
@@ -173,7 +173,33 @@ async def obter_operadoras(
     Returns:
         Lista de operadoras.
     """
-    return await fazer_requisicao_get('operadoras/', user_id=user_id)
+    return await fazer_requisicao_get(
+        'enderecos/busca/operadoras/listar', user_id=user_id
+    )
+
+
+async def obter_id_operadora(
+    nome: str,
+    user_id: Optional[int] = None,
+) -> Optional[int]:
+    """
+    Resolve o nome (ou código) de uma operadora para o seu ID.
+
+    Args:
+        nome: Nome ou código da operadora, sem diferenciar maiúsculas.
+        user_id: ID do usuário do Telegram (opcional) para autenticação.
+
+    Returns:
+        ID da operadora, ou None se nenhuma corresponder.
+    """
+    nome = nome.casefold()
+    for operadora in await obter_operadoras(user_id=user_id) or ():
+        if nome in {
+            str(operadora.get('nome') or '').casefold(),
+            str(operadora.get('codigo') or '').casefold(),
+        }:
+            return operadora.get('id')
+    return None
 
 
 @cached(query_cache)  # Adicionado decorador
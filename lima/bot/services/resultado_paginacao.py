@@ -25,6 +25,11 @@ logger = logging.getLogger(__name__)
 # Constante para truncamento de descrições
 MAX_DESC_CURTA_LEN = 50
 
+# Botão imutável de cancelar, reutilizado em todas as páginas
+_BOTAO_CANCELAR_BUSCA = InlineKeyboardButton(
+    '🚫 Cancelar', callback_data='cancelar_busca'
+)
+
 
 class InfoPaginacao(NamedTuple):
     """Informações de paginação para múltiplos resultados."""
@@ -51,7 +56,7 @@ class ResultadoPaginador:
         """Valida e extrai o número da página do callback data."""
         try:
             if query.data.startswith('multiplos_pagina_'):
-                pagina_str = query.data.replace('multiplos_pagina_', '')
+                pagina_str = query.data.removeprefix('multiplos_pagina_')
                 return int(pagina_str)
             else:
                 logger.error(f'Callback inválido para paginação: {query.data}')
@@ -68,7 +73,7 @@ class ResultadoPaginador:
         context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery
     ) -> tuple[list, str, str, str] | None:
         """Obtém os dados da busca atual do contexto."""
-        resultados = context.user_data.get('resultados_busca', [])
+        resultados = context.user_data.get('resultados_busca')
         codigo = context.user_data.get('codigo_busca', '')
         nome_tipo = context.user_data.get('nome_tipo_codigo', 'código')
         tipo_codigo_busca = context.user_data.get(
@@ -340,9 +345,7 @@ class ResultadoPaginador:
             keyboard_buttons.extend(botoes_paginacao)
 
         # Adicionar botão de cancelar
-        keyboard_buttons.append([
-            InlineKeyboardButton('🚫 Cancelar', callback_data='cancelar_busca')
-        ])
+        keyboard_buttons.append([_BOTAO_CANCELAR_BUSCA])
 
         reply_markup = InlineKeyboardMarkup(keyboard_buttons)
         return mensagem, reply_markup
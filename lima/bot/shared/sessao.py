@@ -0,0 +1,73 @@
+"""
+Resultados da busca atual do usuário e os caches derivados deles.
+
+Toda troca ou limpeza dos resultados passa por aqui, para que nenhum
+fluxo esqueça de descartar o que dependia da busca anterior.
+
+Páginas formatadas, o índice de seleção e a assinatura da última página
+exibida são refeitos a partir de resultados_busca. Eles vivem num
+contêiner guardado no user_data que a persistência não copia nem grava:
+a Application faz deepcopy do user_data a cada update para persisti-lo,
+e a assinatura usa hash() de str, que muda a cada processo.
+"""
+
+from typing import Any, Optional
+
+# Chave do contêiner de caches no user_data
+_CHAVE_CACHES = '_caches_sessao'
+
+# Chaves do user_data que descrevem a busca atual
+_CHAVES_RESULTADOS = ('resultados_busca', 'busca_criterios', 'pagina_atual')
+
+
+class CachesSessao(dict):
+    """Dicionário que a persistência do bot enxerga sempre vazio."""
+
+    def __deepcopy__(self, memo: dict) -> 'CachesSessao':
+        return CachesSessao()
+
+    def __reduce__(self) -> tuple:
+        return CachesSessao, ()
+
+
+def obter_caches(user_data: dict[str, Any]) -> CachesSessao:
+    """Retorna os caches derivados do usuário, criando-os se preciso."""
+    caches = user_data.get(_CHAVE_CACHES)
+    if caches is None:
+        caches = user_data[_CHAVE_CACHES] = CachesSessao()
+    return caches
+
+
+def limpar_caches(user_data: dict[str, Any]) -> None:
+    """Descarta os caches derivados dos resultados anteriores."""
+    caches = user_data.get(_CHAVE_CACHES)
+    if caches:
+        caches.clear()
+
+
+def substituir_resultados(
+    user_data: dict[str, Any],
+    resultados: Any,
+    criterios: Optional[dict[str, Any]] = None,
+) -> None:
+    """
+    Troca os resultados da busca atual, a partir da primeira página.
+
+    Tudo o que derivava dos resultados anteriores é descartado. Sem
+    critérios (buscas que a listagem da API não repete), os filtros dos
+    resultados ficam indisponíveis.
+    """
+    user_data['resultados_busca'] = resultados
+    user_data['pagina_atual'] = 0
+    if criterios:
+        user_data['busca_criterios'] = criterios
+    else:
+        user_data.pop('busca_criterios', None)
+    limpar_caches(user_data)
+
+
+def limpar_resultados(user_data: dict[str, Any]) -> None:
+    """Descarta os resultados da busca atual e tudo o que deriva deles."""
+    for chave in _CHAVES_RESULTADOS:
+        user_data.pop(chave, None)
+    limpar_caches(user_data)
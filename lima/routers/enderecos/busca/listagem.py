@@ -36,6 +36,9 @@ class EnderecoFilterParams(BaseModel):
     compartilhado: bool | None = Field(
         default=None, description='Flag para endereços compartilhados'
     )
+    operadora_id: int | None = Field(
+        default=None, description='ID da operadora presente no endereço'
+    )
     query: str | None = Field(
         default=None, description='Texto para busca livre'
     )
@@ -140,6 +143,14 @@ def _criar_filtros(filter_params: EnderecoFilterParams):
     if filter_params.compartilhado is not None:
         filters.append(Endereco.compartilhado == filter_params.compartilhado)
 
+    if filter_params.operadora_id:
+        # EXISTS na associação, sem duplicar endereços como faria um JOIN
+        filters.append(
+            Endereco.operadoras.any(
+                EnderecoOperadora.operadora_id == filter_params.operadora_id
+            )
+        )
+
     # Busca textual
     if filter_params.query:
         text_search = or_(
@@ -174,6 +185,7 @@ async def _registrar_busca_auditoria(
         'municipio': filter_params.municipio or '',
         'bairro': filter_params.bairro or '',
         'query': filter_params.query or '',
+        'operadora_id': filter_params.operadora_id or '',
     }
 
     parametros = ','.join(f'{k}={v}' for k, v in parametros_dict.items() if v)
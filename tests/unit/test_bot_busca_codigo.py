@@ -0,0 +1,69 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from telegram.ext import ConversationHandler
+
+from lima.bot.handlers import busca_codigo
+from lima.bot.shared.sessao import obter_caches
+
+USER_ID = 42
+
+
+@pytest.fixture
+def entrada(monkeypatch):
+    """Código de operadora válido, digitado por um usuário autenticado."""
+    monkeypatch.setattr(
+        busca_codigo,
+        '_validar_entrada_e_obter_codigo_tipo',
+        AsyncMock(return_value=('SPO123', 'cod_operadora', 'Operadora')),
+    )
+    monkeypatch.setattr(
+        busca_codigo,
+        'validar_dados_usuario_contexto',
+        AsyncMock(return_value=(1, USER_ID)),
+    )
+    monkeypatch.setattr(busca_codigo, '_enviar_acao_digitando', MagicMock())
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures('entrada')
+async def test_resposta_vazia_da_api_informa_nenhum_endereco(monkeypatch):
+    """A API devolve None num 404: a resposta é 'nenhum endereço'."""
+    monkeypatch.setattr(
+        busca_codigo,
+        'buscar_endereco_por_codigo',
+        AsyncMock(return_value=None),
+    )
+    update = MagicMock()
+    update.effective_message.reply_text = AsyncMock()
+    context = MagicMock()
+    context.user_data = {}
+    caches = obter_caches(context.user_data)
+    caches['resultados_index'] = {'1': {'id': 1}}
+
+    estado = await busca_codigo.processar_codigo(update, context)
+
+    assert estado == ConversationHandler.END
+    args = update.effective_message.reply_text.call_args.kwargs
+    assert 'Nenhum endereço encontrado' in args['text']
+    assert 'resultados_index' not in caches
+
+
+def test_acao_digitando_fica_com_a_application():
+    """O 'typing' roda numa task da Application, ligada ao update."""
+    update = MagicMock()
+    update.effective_message.chat_id = USER_ID
+    context = MagicMock()
+    context.bot.send_chat_action = AsyncMock()
+
+    busca_codigo._enviar_acao_digitando(update, context)
+
+    context.application.create_task.assert_called_once()
+    coro = context.application.create_task.call_args.args[0]
+    assert context.application.create_task.call_args.kwargs == {
+        'update': update
+    }
+    coro.close()
+    context.bot.send_chat_action.assert_called_once_with(
+        chat_id=USER_ID, action='typing'
+    )
@@ -0,0 +1,445 @@
+import pickle
+from copy import deepcopy
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from telegram import CallbackQuery, Chat, Message, Update, User
+
+from lima.bot import main
+from lima.bot.handlers import busca, callback, explorar_base
+from lima.bot.handlers.callback import (
+    handle_callback,
+    pagina_callback,
+)
+from lima.bot.keyboards import (
+    criar_teclado_filtros,
+    criar_teclado_operadoras_comuns,
+    criar_teclado_resultados_combinado,
+    criar_teclado_tipos_endereco,
+    criar_teclado_ufs_comuns,
+)
+from lima.bot.services.endereco import FiltrosEndereco
+from lima.bot.shared.sessao import (
+    limpar_resultados,
+    obter_caches,
+    substituir_resultados,
+)
+
+# Mais de uma página de resultados (ITENS_POR_PAGINA padrão é 5)
+TOTAL_RESULTADOS = 7
+USER_ID = 42
+ID_OPERADORA = 3
+
+
+def _criar_resultados(total=TOTAL_RESULTADOS):
+    return [
+        {
+            'id': i,
+            'codigo_endereco': f'END-{i}',
+            'logradouro': f'Rua {i}',
+            'bairro': 'Centro',
+            'municipio': 'São Paulo',
+            'uf': 'SP',
+        }
+        for i in range(1, total + 1)
+    ]
+
+
+def _descartar_task(coro, update=None):
+    """Substitui Application.create_task sem executar a coroutine."""
+    coro.close()
+
+
+def _criar_contexto(user_data=None):
+    context = MagicMock()
+    context.user_data = {} if user_data is None else user_data
+    context.bot_data = {}
+    context.application.create_task = MagicMock(side_effect=_descartar_task)
+    return context
+
+
+def _criar_update(data, message_id=1):
+    query = MagicMock()
+    query.data = data
+    query.answer = AsyncMock()
+    query.edit_message_text = AsyncMock()
+    query.message.message_id = message_id
+    query.message.reply_markup = None
+    query.message.text_markdown_v2 = ''
+    query.message.edit_text = AsyncMock()
+    query.message.reply_text = AsyncMock()
+    update = MagicMock()
+    update.callback_query = query
+    update.effective_message = query.message
+    update.effective_user.id = USER_ID
+    return update
+
+
+class TestMenuFiltrosResultados:
+    """Testes do menu de filtros exibido no lugar dos resultados."""
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_mostrar_filtros_edita_a_mensagem_dos_resultados():
+        """O menu de filtros substitui a página em vez de nova mensagem."""
+        context = _criar_contexto({'resultados_busca': _criar_resultados()})
+        obter_caches(context.user_data)['_ultima_pagina_exibida'] = (1, 123)
+        update = _criar_update('mostrar_filtros')
+
+        await handle_callback(update, context)
+
+        query = update.callback_query
+        query.edit_message_text.assert_awaited_once_with(
+            'Selecione um filtro:', reply_markup=criar_teclado_filtros()
+        )
+        query.message.reply_text.assert_not_awaited()
+        assert '_ultima_pagina_exibida' not in obter_caches(context.user_data)
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_teclado_de_uf_substitui_o_menu_de_filtros():
+        """As opções de UF também editam a mensagem do menu."""
+        context = _criar_contexto({'resultados_busca': _criar_resultados()})
+        update = _criar_update('filtrar_uf')
+
+        await handle_callback(update, context)
+
+        update.callback_query.edit_message_text.assert_awaited_once_with(
+            'Selecione uma UF:', reply_markup=criar_teclado_ufs_comuns()
+        )
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_voltar_redesenha_a_pagina_zero():
+        """'filtrar_voltar' devolve a primeira página à mesma mensagem."""
+        context = _criar_contexto({'resultados_busca': _criar_resultados()})
+
+        await handle_callback(_criar_update('mostrar_filtros'), context)
+        update = _criar_update('filtrar_voltar')
+        await handle_callback(update, context)
+
+        query = update.callback_query
+        query.message.edit_text.assert_awaited_once()
+        args, kwargs = query.message.edit_text.call_args
+        assert 'Exibindo resultados 1\\-5 de 7' in args[0]
+        assert kwargs['reply_markup'] == criar_teclado_resultados_combinado(
+            pagina_atual=0, total_resultados=TOTAL_RESULTADOS
+        )
+        assert context.user_data['pagina_atual'] == 0
+
+
+def _criar_update_real(data):
+    """Update de callback real, para testar os filtros dos handlers."""
+    usuario = User(id=42, first_name='Teste', is_bot=False)
+    chat = Chat(id=42, type=Chat.PRIVATE)
+    mensagem = Message(
+        message_id=1, date=datetime.now(timezone.utc), chat=chat
+    )
+    query = CallbackQuery(
+        id='1',
+        from_user=usuario,
+        chat_instance='1',
+        data=data,
+        message=mensagem,
+    )
+    return Update(update_id=1, callback_query=query)
+
+
+class TestRoteamentoCallbacks:
+    """Testes da ordem dos handlers registrados em main.py."""
+
+    @staticmethod
+    @pytest.fixture
+    def aplicacao(monkeypatch):
+        monkeypatch.setattr(main, 'TOKEN_BOT', '123:ABC')
+        monkeypatch.setattr(main, 'BOT_PERSISTENCE_FILE', '')
+        return main.criar_aplicacao()
+
+    @staticmethod
+    def _primeiro_handler(aplicacao, data):
+        update = _criar_update_real(data)
+        for handler in aplicacao.handlers[0]:
+            if handler.check_update(update):
+                return handler
+        return None
+
+    @pytest.mark.parametrize(
+        'data',
+        [
+            'mostrar_filtros',
+            'filtrar_voltar',
+            'filtrar_uf',
+            'filtrar_uf_SP',
+            'filtrar_op_VIVO',
+            'pagina_1',
+            'ler_anotacoes_3',
+            'pagina_info',
+            'pagina_proxima',
+            'pagina_anterior',
+        ],
+    )
+    def test_callbacks_dos_resultados_chegam_ao_handler_geral(
+        self, aplicacao, data
+    ):
+        handler = self._primeiro_handler(aplicacao, data)
+        assert handler.callback is handle_callback
+
+    @pytest.mark.parametrize(
+        'teclado',
+        [
+            criar_teclado_filtros,
+            criar_teclado_ufs_comuns,
+            criar_teclado_operadoras_comuns,
+            criar_teclado_tipos_endereco,
+        ],
+    )
+    def test_botoes_do_menu_de_filtros_chegam_ao_handler_geral(
+        self, aplicacao, teclado
+    ):
+        for linha in teclado().inline_keyboard:
+            for botao in linha:
+                handler = self._primeiro_handler(
+                    aplicacao, botao.callback_data
+                )
+                assert handler.callback is handle_callback, botao.callback_data
+
+    @pytest.mark.parametrize(
+        'data', ['filtro_uf', 'filtro_operadora', 'explorar_voltar']
+    )
+    def test_filtros_da_exploracao_ficam_com_explorar_base(
+        self, aplicacao, data
+    ):
+        handler = self._primeiro_handler(aplicacao, data)
+        assert handler.callback is explorar_base.handle_explorar_callback
+
+
+class TestPaginacaoResultados:
+    """Testes do despacho dos callbacks de paginação."""
+
+    @staticmethod
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        'data', ['pagina_proxima', 'pagina_anterior', 'pagina_info']
+    )
+    async def test_botoes_sem_numero_nao_redesenham_a_mensagem(data):
+        context = _criar_contexto({
+            'resultados_busca': _criar_resultados(total=12),
+            'pagina_atual': 1,
+        })
+        update = _criar_update(data)
+
+        await handle_callback(update, context)
+
+        update.callback_query.message.edit_text.assert_not_awaited()
+        assert context.user_data['pagina_atual'] == 1
+        assert '_pagina_cache' not in obter_caches(context.user_data)
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_pagina_numerada_redesenha_a_mensagem():
+        context = _criar_contexto({'resultados_busca': _criar_resultados()})
+        update = _criar_update('pagina_1')
+
+        await handle_callback(update, context)
+
+        update.callback_query.message.edit_text.assert_awaited_once()
+        assert context.user_data['pagina_atual'] == 1
+
+
+class TestFiltroResultados:
+    """Testes do despacho dos filtros aplicados aos resultados."""
+
+    @staticmethod
+    @pytest.fixture
+    def api(monkeypatch):
+        """Substitui as chamadas à API usadas por _processar_busca."""
+        buscar_endereco = AsyncMock(return_value=_criar_resultados(total=3))
+        obter_id_operadora = AsyncMock(return_value=ID_OPERADORA)
+        monkeypatch.setattr(busca, 'buscar_endereco', buscar_endereco)
+        monkeypatch.setattr(busca, 'obter_id_operadora', obter_id_operadora)
+        monkeypatch.setattr(busca, 'registrar_busca', AsyncMock())
+        return buscar_endereco, obter_id_operadora
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_filtro_de_operadora_vai_para_a_consulta_da_api(api):
+        buscar_endereco, obter_id_operadora = api
+        context = _criar_contexto({
+            'resultados_busca': _criar_resultados(),
+            'busca_criterios': {'query': 'centro', 'uf': 'SP'},
+        })
+
+        await handle_callback(_criar_update('filtrar_op_VIVO'), context)
+
+        obter_id_operadora.assert_awaited_once_with('VIVO', user_id=USER_ID)
+        filtros = buscar_endereco.call_args.args[0]
+        assert filtros == FiltrosEndereco(
+            query='centro', uf='SP', operadora_id=ID_OPERADORA
+        )
+        assert context.user_data['busca_criterios'] == {
+            'query': 'centro',
+            'uf': 'SP',
+            'operadora': 'VIVO',
+        }
+        assert (
+            context.user_data['resultados_busca']
+            == buscar_endereco.return_value
+        )
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_operadora_desconhecida_nao_consulta_a_listagem(api):
+        buscar_endereco, obter_id_operadora = api
+        obter_id_operadora.return_value = None
+        resultados = _criar_resultados()
+        context = _criar_contexto({
+            'resultados_busca': resultados,
+            'busca_criterios': {'uf': 'SP'},
+        })
+        update = _criar_update('filtrar_op_XYZ')
+
+        await handle_callback(update, context)
+
+        buscar_endereco.assert_not_awaited()
+        assert context.user_data['resultados_busca'] is resultados
+        update.effective_message.reply_text.assert_awaited()
+
+    @staticmethod
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        'criterios',
+        [
+            {'latitude': -23.5, 'longitude': -46.6},
+            {'id_endereco': 10},
+            {'codigo_operadora': 'SPO123'},
+            {},
+        ],
+    )
+    async def test_busca_sem_listagem_recusa_o_filtro(api, criterios):
+        buscar_endereco, _ = api
+        context = _criar_contexto({
+            'resultados_busca': _criar_resultados(),
+            'busca_criterios': criterios,
+        })
+        update = _criar_update('filtrar_uf_SP')
+
+        await handle_callback(update, context)
+
+        buscar_endereco.assert_not_awaited()
+        args, _ = update.callback_query.message.reply_text.call_args
+        assert 'não se aplicam' in args[0]
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_filtro_sem_resultados_avisa_na_resposta(monkeypatch):
+        processar_busca = AsyncMock()
+        monkeypatch.setattr(callback, '_processar_busca', processar_busca)
+        context = _criar_contexto()
+        update = _criar_update('filtrar_uf_SP')
+
+        await handle_callback(update, context)
+
+        update.callback_query.answer.assert_awaited_once()
+        assert update.callback_query.answer.call_args.args[0]
+        processar_busca.assert_not_awaited()
+        context.application.create_task.assert_not_called()
+
+
+class TestCachePaginas:
+    """Testes do descarte das páginas formatadas de buscas anteriores."""
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_nova_busca_descarta_cache_e_indice(monkeypatch):
+        context = _criar_contexto({'resultados_busca': _criar_resultados()})
+        caches = obter_caches(context.user_data)
+        caches['resultados_index'] = {'1': {'id': 1}}
+        await pagina_callback(_criar_update('pagina_1'), context)
+        assert '_pagina_cache' in caches
+
+        novos = _criar_resultados(total=3)
+        monkeypatch.setattr(
+            busca, 'buscar_endereco', AsyncMock(return_value=novos)
+        )
+        monkeypatch.setattr(busca, 'registrar_busca', AsyncMock())
+        update = _criar_update('pagina_1')
+
+        await busca._processar_busca(
+            update, context, params_busca={'query': 'centro'}
+        )
+
+        assert context.user_data['resultados_busca'] == novos
+        assert not caches
+
+    @staticmethod
+    def test_resultados_substituidos_refazem_o_cache():
+        resultados = _criar_resultados()
+        context = _criar_contexto({'resultados_busca': resultados})
+        primeira = callback._obter_mensagem_pagina(
+            context, resultados, 0, TOTAL_RESULTADOS
+        )
+        caches = obter_caches(context.user_data)
+        assert caches['_pagina_cache']['fonte'] is resultados
+
+        novos = _criar_resultados(total=TOTAL_RESULTADOS * 2)
+        context.user_data['resultados_busca'] = novos
+        segunda = callback._obter_mensagem_pagina(
+            context, novos, 0, len(novos)
+        )
+
+        cache = caches['_pagina_cache']
+        assert cache['fonte'] is novos
+        assert cache['total_paginas'] == callback._contar_paginas(len(novos))
+        assert f'de {TOTAL_RESULTADOS}' in primeira[0]
+        assert f'de {len(novos)}' in segunda[0]
+
+
+class TestCachesSessao:
+    """Testes dos caches derivados, mantidos fora da persistência."""
+
+    @staticmethod
+    def test_persistencia_nao_copia_nem_grava_os_caches():
+        user_data = {'resultados_busca': _criar_resultados()}
+        caches = obter_caches(user_data)
+        caches['_ultima_pagina_exibida'] = (1, 123)
+        caches['resultados_index'] = {'1': {'id': 1}}
+
+        copia = deepcopy(user_data)
+        restaurado = pickle.loads(pickle.dumps(user_data))
+
+        for dados in (copia, restaurado):
+            assert dados['resultados_busca'] == user_data['resultados_busca']
+            assert not obter_caches(dados)
+        assert obter_caches(user_data) is caches
+
+    @staticmethod
+    def test_substituir_resultados_descarta_o_que_derivava_da_busca():
+        user_data = {
+            'resultados_busca': _criar_resultados(),
+            'busca_criterios': {'uf': 'SP'},
+            'pagina_atual': 1,
+        }
+        caches = obter_caches(user_data)
+        caches['resultados_index'] = {'1': {'id': 1}}
+        novos = _criar_resultados(total=3)
+
+        substituir_resultados(user_data, novos)
+
+        assert user_data['resultados_busca'] is novos
+        assert user_data['pagina_atual'] == 0
+        assert 'busca_criterios' not in user_data
+        assert not caches
+
+    @staticmethod
+    def test_limpar_resultados_remove_a_busca_atual():
+        user_data = {'filtros_ativos': {'uf': 'SP'}}
+        substituir_resultados(user_data, _criar_resultados(), {'uf': 'SP'})
+        obter_caches(user_data)['resultados_index'] = {}
+
+        limpar_resultados(user_data)
+
+        assert user_data['filtros_ativos'] == {'uf': 'SP'}
+        for chave in ('resultados_busca', 'busca_criterios', 'pagina_atual'):
+            assert chave not in user_data
+        assert not obter_caches(user_data)